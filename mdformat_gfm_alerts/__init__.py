@@ -1,11 +1,64 @@
 """An mdformat plugin for `gfm_alerts`."""
 
+# ruff:file-ignore[non-empty-init-module]
+
+from __future__ import annotations
+
+from importlib import import_module
+
+# Importing `typing` would cost more than the rest of this module, and type checkers treat this like its constant
+TYPE_CHECKING = False
+
 __version__ = "2.1.0"
 
 __plugin_name__ = "gfm_alerts"
 
 # FYI see source code for available interfaces:
 #   https://github.com/executablebooks/mdformat/blob/5d9b573ce33bae219087984dd148894c774f41d4/src/mdformat/plugins.py
-from .plugin import RENDERERS, add_cli_argument_group, update_mdit
+if TYPE_CHECKING:
+    from typing import Any
+
+    from ._cli import add_cli_argument_group
+    from .aio import AsyncFormatter
+    from .batch import AlertRenderer, format_many
+    from .plugin import RENDERERS, update_mdit
+    from .stream import format_stream
+
+__all__ = (
+    "RENDERERS",
+    "AlertRenderer",
+    "AsyncFormatter",
+    "add_cli_argument_group",
+    "format_many",
+    "format_stream",
+    "update_mdit",
+)
+
+# Loading the entry point imports this module for every mdformat run, so the interfaces (and markdown-it and
+# mdformat.renderer behind them) are only imported once mdformat or a caller first asks for one. The CLI asks for
+# `add_cli_argument_group` on every run, so it lives apart from the rest and imports nothing.
+_LAZY_ATTRIBUTES = {
+    "RENDERERS": ".plugin",
+    "add_cli_argument_group": "._cli",
+    "update_mdit": ".plugin",
+    "format_many": ".batch",
+    "AlertRenderer": ".batch",
+    "format_stream": ".stream",
+    "AsyncFormatter": ".aio",
+}
+
+
+def __getattr__(name: str) -> Any:  # ruff: ignore[any-type]
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    value = getattr(import_module(module_name, __name__), name)
+    # Cache it here, so `__getattr__` only runs on first access
+    globals()[name] = value
+    return value
+
 
-__all__ = ("RENDERERS", "add_cli_argument_group", "update_mdit")
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
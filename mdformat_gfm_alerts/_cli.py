@@ -0,0 +1,32 @@
+"""mdformat CLI options.
+
+The CLI adds every plugin's options on each run, even when it ends up formatting nothing, so this module imports
+neither markdown-it nor mdformat.
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import argparse
+
+
+def add_cli_argument_group(group: argparse._ArgumentGroup) -> None:
+    """Add options to the mdformat CLI.
+
+    Stored in `mdit.options["mdformat"]["plugin"]["gfm_alerts"]`
+
+    """
+    group.add_argument(
+        "--custom-title",
+        action="store_const",
+        const=True,
+        help=(
+            "Preserve an inline custom title on the canonical `[!TYPE]` line. "
+            "This convention comes from Obsidian's callout spec (Hugo's alert "
+            "syntax mirrors it). It's not part of GitHub's own GFM alerts spec, "
+            "so it's off by default."
+        ),
+    )
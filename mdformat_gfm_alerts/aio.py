@@ -0,0 +1,148 @@
+"""Format and render documents from asyncio code without blocking the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import queue
+from collections.abc import Callable, Generator, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from functools import partial
+from typing import Any, Generic, TypeVar
+
+from markdown_it import MarkdownIt
+
+from .batch import BatchFormatter, FormatterConfig
+from .mdit_plugins import gfm_alerts_plugin
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_T = TypeVar("_T")
+
+
+class _Pool(Generic[_T]):
+    """Parsers built on first use and lent to one worker thread at a time.
+
+    At most one parser per concurrently running job is ever built, so the pool never outgrows the executor.
+
+    """
+
+    def __init__(self, build: Callable[[], _T]) -> None:
+        self._build = build
+        self._idle: queue.SimpleQueue[_T] = queue.SimpleQueue()
+
+    @contextmanager
+    def borrow(self) -> Generator[_T, None, None]:
+        try:
+            item = self._idle.get_nowait()
+        except queue.Empty:
+            item = self._build()
+        try:
+            yield item
+        finally:
+            self._idle.put(item)
+
+
+def default_markdown_it() -> MarkdownIt:
+    """The HTML parser `AsyncFormatter.render` uses unless given another."""
+    return MarkdownIt("commonmark").use(gfm_alerts_plugin)
+
+
+class AsyncFormatter:
+    """Formats Markdown and renders HTML on a bounded pool of worker threads.
+
+    `format` matches `mdformat.text` with the `gfm_alerts` extension and `render` matches `MarkdownIt.render`,
+    but both run in worker threads, so a large page doesn't stall other requests on the event loop. Parsers are
+    configured once per worker and reused. At most `max_pending` documents are queued or being parsed; further
+    callers wait for a slot, which gives a busy server backpressure instead of an unbounded queue. Cancelling a
+    caller drops its document if no worker has picked it up yet. A document already being parsed can't be
+    interrupted, so it keeps its slot until it finishes.
+
+    Use one instance per event loop, and `close` it (or use it as an async context manager) on shutdown.
+
+    """
+
+    def __init__(
+        self,
+        options: Mapping[str, Any] | None = None,
+        *,
+        extensions: Iterable[str] = (),
+        codeformatters: Iterable[str] = (),
+        markdown_it: Callable[[], MarkdownIt] = default_markdown_it,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int | None = None,
+    ) -> None:
+        """Configure the pools; parsers themselves are built on first use.
+
+        `options`, `extensions`, and `codeformatters` are as for `format_many`. `markdown_it` builds each pooled
+        HTML parser. `max_pending` defaults to four documents per worker.
+
+        Raises:
+            ValueError: if `max_workers` or `max_pending` is less than 1
+
+        """
+        max_pending = 4 * max_workers if max_pending is None else max_pending
+        if max_workers < 1 or max_pending < 1:
+            msg = f"max_workers and max_pending must be at least 1, not {max_workers} and {max_pending}"
+            raise ValueError(msg)
+        config = FormatterConfig.from_args(options, extensions, codeformatters)
+        self._formatters = _Pool(partial(BatchFormatter, config))
+        self._parsers = _Pool(markdown_it)
+        self._slots = asyncio.Semaphore(max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="gfm-alerts"
+        )
+
+    async def format(self, text: str) -> str:
+        """Format one document, exactly like `mdformat.text`."""
+        return await self._submit(self._format, text)
+
+    async def render(self, text: str) -> str:
+        """Render one document to HTML."""
+        return await self._submit(self._render, text)
+
+    def close(self) -> None:
+        """Stop taking documents: queued ones are cancelled, and ones being parsed finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # `typing.Self` needs Python 3.11
+    async def __aenter__(self) -> AsyncFormatter:  # ruff: ignore[non-self-return-type]
+        """Return this formatter, to be closed on exit."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the formatter."""
+        self.close()
+
+    def _format(self, text: str) -> str:
+        with self._formatters.borrow() as formatter:
+            return formatter.format(text)
+
+    def _render(self, text: str) -> str:
+        with self._parsers.borrow() as md:
+            return md.render(text)
+
+    async def _submit(self, func: Callable[[str], str], text: str) -> str:
+        await self._slots.acquire()
+        try:
+            future = self._executor.submit(func, text)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Released when the work is actually done (or cancelled before it started), not when the caller stops
+        # waiting, so cancelled callers can't push more documents onto busy workers than `max_pending`
+        future.add_done_callback(
+            partial(_release_soon, asyncio.get_running_loop(), self._slots)
+        )
+        return await asyncio.wrap_future(future)
+
+
+def _release_soon(
+    loop: asyncio.AbstractEventLoop,
+    slots: asyncio.Semaphore,
+    _future: Future[str],
+) -> None:
+    # Runs in the worker thread, and the loop may have closed while the document was being parsed
+    with suppress(RuntimeError):
+        loop.call_soon_threadsafe(slots.release)
@@ -0,0 +1,228 @@
+"""Format or render many documents with one configured parser."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Executor
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from markdown_it import MarkdownIt
+
+# `mdformat.text` is a thin wrapper around these two; reusing them keeps the output byte-for-byte identical
+from mdformat._conf import DEFAULT_OPTS  # ruff: ignore[import-private-name]
+from mdformat._util import build_mdit  # ruff: ignore[import-private-name]
+from mdformat.renderer import MDRenderer
+
+from . import __plugin_name__
+from .mdit_plugins import gfm_alerts_plugin
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
+    from .mdit_plugins import IconSet
+
+
+class FormatterConfig(NamedTuple):
+    """Hashable, picklable description of a formatter, so worker processes can rebuild it."""
+
+    options_json: str
+    extensions: tuple[str, ...]
+    codeformatters: tuple[str, ...]
+
+    @classmethod
+    def from_args(
+        cls,
+        options: Mapping[str, Any] | None = None,
+        extensions: Iterable[str] = (),
+        codeformatters: Iterable[str] = (),
+    ) -> FormatterConfig:
+        """Normalize `mdformat.text`-style arguments, always including this extension."""
+        extensions = tuple(extensions)
+        if __plugin_name__ not in extensions:
+            extensions = (*extensions, __plugin_name__)
+        return cls(
+            options_json=json.dumps(dict(options or {}), sort_keys=True),
+            extensions=extensions,
+            codeformatters=tuple(codeformatters),
+        )
+
+    @property
+    def options(self) -> dict[str, Any]:
+        """The mdformat options this config was created from."""
+        options: dict[str, Any] = json.loads(self.options_json)
+        return options
+
+
+class BatchFormatter:
+    """An mdformat parser and renderer built once and reused for every document."""
+
+    def __init__(self, config: FormatterConfig) -> None:
+        """Configure the parser once, the same way `mdformat.text` does per call."""
+        self.config = config
+        options = config.options
+        self._second_pass = options.get("wrap", DEFAULT_OPTS["wrap"]) != "keep"
+        self._mdit: MarkdownIt = build_mdit(
+            MDRenderer,
+            mdformat_opts={**options, "filename": ""},
+            extensions=config.extensions,
+            codeformatters=config.codeformatters,
+        )
+
+    def format(self, text: str) -> str:
+        """Format one document, exactly like `mdformat.text`."""
+        rendering = self._mdit.render(text)
+        if self._second_pass:
+            rendering = self._mdit.render(rendering)
+        return rendering
+
+
+@lru_cache(maxsize=16)
+def get_formatter(config: FormatterConfig) -> BatchFormatter:
+    """Shared formatter for `config`, built at most once per process."""
+    return BatchFormatter(config)
+
+
+def _format_with(config: FormatterConfig, text: str) -> str:
+    return get_formatter(config).format(text)
+
+
+def format_many(
+    texts: Iterable[str],
+    options: Mapping[str, Any] | None = None,
+    *,
+    extensions: Iterable[str] = (),
+    codeformatters: Iterable[str] = (),
+    executor: Executor | None = None,
+    chunksize: int = 1,
+    cache: ResultCache | None = None,
+) -> Iterator[str]:
+    """Format each of `texts`, yielding results in input order.
+
+    Output matches `mdformat.text(text, options=options, extensions={"gfm_alerts", *extensions})`, but the parser
+    is only configured once. `options` must be JSON-serializable, as they are in `.mdformat.toml`.
+
+    Pass a `ThreadPoolExecutor` or `ProcessPoolExecutor` to spread documents over workers; each worker process
+    builds its own parser on first use. `chunksize` is forwarded to `ProcessPoolExecutor.map` to amortize
+    inter-process overhead for many small documents. Pass a `ResultCache` to return previously formatted output
+    without parsing; only misses reach the parser or executor.
+
+    """
+    config = FormatterConfig.from_args(options, extensions, codeformatters)
+    if cache is not None:
+        return _format_cached(texts, config, cache, executor, chunksize)
+    if executor is None:
+        return map(get_formatter(config).format, texts)
+    return executor.map(partial(_format_with, config), texts, chunksize=chunksize)
+
+
+def _format_cached(
+    texts: Iterable[str],
+    config: FormatterConfig,
+    cache: ResultCache,
+    executor: Executor | None,
+    chunksize: int,
+) -> Iterator[str]:
+    if executor is None:
+        formatter = get_formatter(config)
+        for text in texts:
+            key = cache.key(text, config)
+            if (formatted := cache.get(key)) is None:
+                formatted = formatter.format(text)
+                cache.put(key, formatted)
+            yield formatted
+        return
+
+    texts = list(texts)
+    keys = [cache.key(text, config) for text in texts]
+    results = [cache.get(key) for key in keys]
+    misses = [index for index, result in enumerate(results) if result is None]
+    formatted_misses = executor.map(
+        partial(_format_with, config),
+        [texts[index] for index in misses],
+        chunksize=chunksize,
+    )
+    for index, formatted in zip(misses, formatted_misses, strict=True):
+        results[index] = formatted
+        cache.put(keys[index], formatted)
+    for result in results:
+        assert result is not None  # for mypy
+        yield result
+
+
+class RendererConfig(NamedTuple):
+    """Hashable, picklable description of an `AlertRenderer`, so worker processes can rebuild it."""
+
+    preset: str
+    plugin_options_json: str
+
+    @property
+    def plugin_options(self) -> dict[str, Any]:
+        """The `gfm_alerts_plugin` keyword arguments this config was created from."""
+        options: dict[str, Any] = json.loads(self.plugin_options_json)
+        return options
+
+
+class AlertRenderer:
+    """A `MarkdownIt` with `gfm_alerts_plugin` configured once and reused to render every page to HTML."""
+
+    def __init__(
+        self,
+        titles: list[str] | None = None,
+        icons: dict[str, str] | IconSet | None = None,
+        class_prefix: str = "markdown-alert",
+        *,
+        parse_nested: bool = True,
+        match_case_sensitive: bool = False,
+        custom_title: bool = False,
+        preset: str = "commonmark",
+    ) -> None:
+        """Configure the parser once. The options are those of `gfm_alerts_plugin`, on a `preset` `MarkdownIt`."""
+        plugin_options = {
+            "titles": titles,
+            "icons": icons,
+            "class_prefix": class_prefix,
+            "parse_nested": parse_nested,
+            "match_case_sensitive": match_case_sensitive,
+            "custom_title": custom_title,
+        }
+        self.config = RendererConfig(preset, json.dumps(plugin_options, sort_keys=True))
+        self._mdit = MarkdownIt(preset).use(gfm_alerts_plugin, **plugin_options)
+
+    @classmethod
+    def from_config(cls, config: RendererConfig) -> AlertRenderer:
+        """Rebuild the renderer `config` describes."""
+        return cls(preset=config.preset, **config.plugin_options)
+
+    def render(self, source: str) -> str:
+        """Render one page, exactly like a new `MarkdownIt` with the same plugin options would."""
+        return self._mdit.render(source)
+
+    def render_many(
+        self,
+        sources: Iterable[str],
+        *,
+        executor: Executor | None = None,
+        chunksize: int = 1,
+    ) -> Iterator[str]:
+        """Render each of `sources`, yielding results in input order.
+
+        Pass a `ProcessPoolExecutor` to spread pages over cores, as for `format_many`; each worker process builds
+        its own parser on first use.
+
+        """
+        if executor is None:
+            return map(self.render, sources)
+        return executor.map(
+            partial(_render_with, self.config), sources, chunksize=chunksize
+        )
+
+
+@lru_cache(maxsize=16)
+def get_renderer(config: RendererConfig) -> AlertRenderer:
+    """Shared renderer for `config`, built at most once per process."""
+    return AlertRenderer.from_config(config)
+
+
+def _render_with(config: RendererConfig, source: str) -> str:
+    return get_renderer(config).render(source)
@@ -0,0 +1,197 @@
+"""Opt-in on-disk cache of formatted output, keyed by a content hash.
+
+Entries are plain files named by the SHA-256 of (input text, resolved options, the plugin's source and the versions
+of every package that parses or renders it), so a hit skips parsing entirely. Writes go to a temporary file that is
+atomically renamed into place, so concurrent readers only ever see complete entries. Each hit refreshes the entry's
+mtime, and the least recently used entries are evicted once the directory grows past `max_bytes`.
+
+Clear the cache from the command line with::
+
+    python -m mdformat_gfm_alerts.cache clear
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import operator
+import os
+import sys
+import tempfile
+from functools import cache
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import markdown_it
+import mdformat
+import mdformat.plugins
+import mdit_py_plugins
+
+from . import __version__
+
+if TYPE_CHECKING:
+    from .batch import FormatterConfig
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_EVICT_TO = 0.8
+"""Fraction of `max_bytes` to evict down to, so eviction doesn't run again on the very next write."""
+
+
+def default_cache_dir() -> Path:
+    """`$MDFORMAT_GFM_ALERTS_CACHE_DIR`, falling back to `$XDG_CACHE_HOME/mdformat-gfm-alerts`."""
+    if override := os.environ.get("MDFORMAT_GFM_ALERTS_CACHE_DIR"):
+        return Path(override)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "mdformat-gfm-alerts"
+
+
+def _extension_versions(extensions: tuple[str, ...]) -> list[str]:
+    """Versions of the other installed extensions, since their output is cached too."""
+    return [
+        f"{name}={getattr(mdformat.plugins.PARSER_EXTENSIONS.get(name), '__version__', '')}"
+        for name in extensions
+    ]
+
+
+@cache
+def _codeformatter_versions(codeformatters: tuple[str, ...]) -> tuple[str, ...]:
+    """Distribution versions of the code formatters, which format fenced code blocks in the cached output."""
+    dists = {
+        entry_point.name: entry_point.dist
+        for entry_point in entry_points(group="mdformat.codeformatter")
+    }
+    return tuple(
+        f"{name}={getattr(dists.get(name), 'version', '')}" for name in codeformatters
+    )
+
+
+@cache
+def _source_digest() -> str:
+    """Hash of the plugin's own sources, so unreleased edits, which don't bump its version, miss the cache."""
+    digest = hashlib.sha256()
+    for source in sorted(Path(__file__).parent.rglob("*.py")):
+        digest.update(source.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU of formatted documents stored under `directory`."""
+
+    def __init__(
+        self, directory: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Use `directory` (created on first write) and evict past `max_bytes`."""
+        self.directory = default_cache_dir() if directory is None else directory
+        self.max_bytes = max_bytes
+        # Approximate, since other processes share the directory
+        self._size: int | None = None
+
+    @staticmethod
+    def key(text: str, config: FormatterConfig) -> str:
+        """Content hash identifying the formatted output of `text` under `config`."""
+        digest = hashlib.sha256()
+        for part in (
+            __version__,
+            _source_digest(),
+            mdformat.__version__,
+            markdown_it.__version__,
+            mdit_py_plugins.__version__,
+            *_extension_versions(config.extensions),
+            config.options_json,
+            *_codeformatter_versions(config.codeformatters),
+            text,
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key[2:]
+
+    def get(self, key: str) -> str | None:
+        """Return the cached output for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            value = path.read_text(encoding="utf-8")
+            # Unlike `touch`, never recreates the file (as an empty entry) if another process just evicted it
+            os.utime(path)
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Store `value` under `key`, evicting the least recently used entries if needed."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = value.encode()
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            Path(tmp_name).replace(path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        if self._size is None:
+            self._size = sum(size for _path, size, _mtime in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> int:
+        """Delete every entry and return how many were removed."""
+        removed = 0
+        for path, _size, _mtime in self._entries():
+            path.unlink(missing_ok=True)
+            removed += 1
+        self._size = 0
+        return removed
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        entries = []
+        for path in self.directory.glob("??/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # Evicted by another process
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=operator.itemgetter(2))
+        size = sum(size for _path, size, _mtime in entries)
+        target = self.max_bytes * _EVICT_TO
+        for path, entry_size, _mtime in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+
+def main(argv: list[str]) -> None:
+    """Command line entry point: `python -m mdformat_gfm_alerts.cache clear`."""
+    parser = argparse.ArgumentParser(prog="python -m mdformat_gfm_alerts.cache")
+    parser.add_argument("command", choices=["clear"])
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=None,
+        help="Cache directory (default: $MDFORMAT_GFM_ALERTS_CACHE_DIR or $XDG_CACHE_HOME/mdformat-gfm-alerts)",
+    )
+    args = parser.parse_args(argv)
+    cache = ResultCache(args.dir)
+    removed = cache.clear()
+    print(f"Removed {removed} cached result(s) from {cache.directory}")  # ruff: ignore[print]
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,3 +1,31 @@
-from ._gfm_alerts import GFM_ALERTS_PREFIX, gfm_alerts_plugin
+from ._gfm_alerts import (
+    BLOCKQUOTE_INDEX_ENV_KEY,
+    ENGINES,
+    GFM_ALERTS_PREFIX,
+    ICON_SETS,
+    AlertMeta,
+    BlockquoteIndex,
+    IconSet,
+    clear_factory_cache,
+    configure_factory_cache,
+    get_blockquote_index,
+    gfm_alerts_plugin,
+    inline_title_cache_info,
+    load_icon_set,
+)
 
-__all__ = ("GFM_ALERTS_PREFIX", "gfm_alerts_plugin")
+__all__ = (
+    "BLOCKQUOTE_INDEX_ENV_KEY",
+    "ENGINES",
+    "GFM_ALERTS_PREFIX",
+    "ICON_SETS",
+    "AlertMeta",
+    "BlockquoteIndex",
+    "IconSet",
+    "clear_factory_cache",
+    "configure_factory_cache",
+    "get_blockquote_index",
+    "gfm_alerts_plugin",
+    "inline_title_cache_info",
+    "load_icon_set",
+)
@@ -3,14 +3,38 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Callable
-from functools import cached_property
+import sys
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Container,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
+from dataclasses import dataclass
+from functools import _CacheInfo, _lru_cache_wrapper, cache, cached_property, lru_cache
+from itertools import accumulate, compress
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, ClassVar, Literal
 
 from markdown_it import MarkdownIt
+from markdown_it.parser_block import RuleFuncBlockType
 from markdown_it.renderer import RendererProtocol
+from markdown_it.rules_block import StateBlock
 from markdown_it.rules_core import StateCore
 from markdown_it.token import Token
 
+from mdformat_gfm_alerts import stats as _stats
 from mdformat_gfm_alerts._helpers import get_conf
 
 GFM_ALERTS_PREFIX = "gfm_alert"
@@ -19,8 +43,183 @@ GFM_ALERTS_PREFIX = "gfm_alert"
 GFM_ALERT_OPEN = f"{GFM_ALERTS_PREFIX}_open"
 GFM_ALERT_CLOSE = f"{GFM_ALERTS_PREFIX}_close"
 
+BLOCKQUOTE_INDEX_ENV_KEY = f"{GFM_ALERTS_PREFIX}_blockquotes"
+"""`env` key of the `BlockquoteIndex` published by the alert rule."""
+
 DEFAULT_TITLES = ["TIP", "NOTE", "IMPORTANT", "WARNING", "CAUTION"]
 
+Engine = Literal["core", "block"]
+ENGINES: tuple[Engine, ...] = ("core", "block")
+"""`core` converts blockquotes in a pass over the parsed tokens, `block` as the blockquote rule emits them."""
+
+IconSet = Literal["octicons"]
+ICON_SETS: tuple[IconSet, ...] = ("octicons",)
+"""Built-in icons for the `DEFAULT_TITLES`, selected by passing a set's name as `icons`."""
+
+_LEGACY_TITLES = ("Note", "Warning")
+
+_MAX_BUILT_OPENINGS = 1024
+"""Bound on openings memoized on demand, since wildcard titles come straight from the (possibly untrusted) source."""
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class AlertMeta(Mapping[str, str]):
+    """`Token.meta` of an alert's opening token.
+
+    Documents can hold thousands of alerts, so this replaces a dict per token with three slots. It still reads
+    like the dict it replaces (`meta["title"]`, `meta.get("inline_title", "")`) and compares equal to one, but
+    it is not a `dict`: serialize tokens with `token.as_dict(meta_serializer=dict)` (or `AlertMeta.as_dict`),
+    since `json.dumps(token.as_dict())` raises `TypeError` on it.
+
+    """
+
+    _KEYS: ClassVar[tuple[str, ...]] = ("title", "icon", "inline_title")
+
+    title: str
+    icon: str
+    inline_title: str = ""
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        value: str = getattr(self, key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def as_dict(self) -> dict[str, str]:
+        """Copy into the plain dict that alert tokens carried before, e.g. for JSON serialization."""
+        return {key: getattr(self, key) for key in self._KEYS}
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class BlockquoteIndex:
+    """Every blockquote of a token stream, alerts included, in document order.
+
+    The alert rule already pairs each blockquote's opening and closing tokens while it scans, so it keeps them
+    here for later core rules and renderers instead of each rescanning the tokens. Row `n` is spread over the
+    columns: the token indices of the `n`th blockquote's opening token, closing token, and first inline (-1 if
+    it has none), and whether it became an alert. Indices refer to the tokens as the alert rule left them.
+
+    """
+
+    opens: array[int]
+    closes: array[int]
+    first_inlines: array[int]
+    alerts: bytearray
+    token_count: int
+
+    def __len__(self) -> int:
+        return len(self.opens)
+
+    def row(self, open_index: int) -> int:
+        """Row of the blockquote whose opening token is `tokens[open_index]`.
+
+        Raises:
+            KeyError: if no blockquote opens at `open_index`
+
+        """
+        row = bisect_left(self.opens, open_index)
+        if row == len(self.opens) or self.opens[row] != open_index:
+            raise KeyError(open_index)
+        return row
+
+    @classmethod
+    def from_tokens(cls, tokens: Sequence[Token]) -> BlockquoteIndex:
+        """Index `tokens` from scratch."""
+        opens: list[int] = []
+        closes: list[int] = []
+        first_inlines: list[int] = []
+        stack: list[int] = []
+        pending = 0
+        for i, token in enumerate(tokens):
+            if token.type in {"blockquote_open", GFM_ALERT_OPEN}:
+                stack.append(len(opens))
+                opens.append(i)
+                closes.append(-1)
+                first_inlines.append(-1)
+                pending += 1
+            elif token.type == "inline":
+                while pending:
+                    first_inlines[stack[-pending]] = i
+                    pending -= 1
+            elif token.type in {"blockquote_close", GFM_ALERT_CLOSE}:
+                row = stack.pop()
+                if first_inlines[row] == -1:
+                    pending -= 1
+                closes[row] = i
+        return cls.from_columns(tokens, opens, closes, first_inlines)
+
+    @classmethod
+    def from_columns(
+        cls,
+        tokens: Sequence[Token],
+        opens: list[int],
+        closes: list[int],
+        first_inlines: list[int],
+    ) -> BlockquoteIndex:
+        """Pack row-aligned token indices into the index of `tokens`, reading each row's alert status from them."""
+        return cls(
+            array("l", opens),
+            array("l", closes),
+            array("l", first_inlines),
+            bytearray(tokens[i].type == GFM_ALERT_OPEN for i in opens),
+            len(tokens),
+        )
+
+
+def get_blockquote_index(
+    tokens: Sequence[Token], env: MutableMapping[str, Any]
+) -> BlockquoteIndex:
+    """The `BlockquoteIndex` of `tokens` published in `env`, built and published first if it is missing.
+
+    The alert rule publishes one whenever it scans nested blockquotes. Other configurations (`engine="block"`,
+    `parse_nested=False`, or a document without any alert marker) are indexed on the first call instead. An
+    index for a different number of tokens is rebuilt, since a later rule must have edited the stream. Like
+    markdown-it's own reference definitions, the index assumes a fresh `env` per document.
+
+    """
+    index = env.get(BLOCKQUOTE_INDEX_ENV_KEY)
+    if not isinstance(index, BlockquoteIndex) or index.token_count != len(tokens):
+        index = BlockquoteIndex.from_tokens(tokens)
+        env[BLOCKQUOTE_INDEX_ENV_KEY] = index
+    return index
+
+
+def _publish_index(
+    env: MutableMapping[str, Any], index: BlockquoteIndex | None
+) -> None:
+    # Without an index from this scan, drop any left by an earlier parse so the next lookup rebuilds it
+    if index is None:
+        env.pop(BLOCKQUOTE_INDEX_ENV_KEY, None)
+    else:
+        env[BLOCKQUOTE_INDEX_ENV_KEY] = index
+
+
+@cache
+def load_icon_set(name: str) -> Mapping[str, str]:
+    """Icons of the built-in set `name` by lowercase title, as pre-escaped SVG.
+
+    Read from the package data on first use, then the same read-only mapping is shared by every factory.
+
+    Raises:
+        ValueError: if `name` isn't one of `ICON_SETS`
+
+    """
+    if name not in ICON_SETS:
+        msg = f"icons must be a dict or one of {ICON_SETS}, not {name!r}"
+        raise ValueError(msg)
+    # Deferred with the file itself, since most configurations never use a built-in set
+    import json  # ruff: ignore[import-outside-top-level]
+
+    data = json.loads(Path(__file__).with_name(f"{name}.json").read_text("utf-8"))
+    icons: dict[str, str] = data["icons"]
+    return MappingProxyType(icons)
+
 
 class AlertRuleFactory:
     """Identifies blockquote tokens and transforms them to alert tokens."""
@@ -28,7 +227,7 @@ class AlertRuleFactory:
     def __init__(
         self,
         titles: list[str] | None = None,
-        icons: dict[str, str] | None = None,
+        icons: Mapping[str, str] | IconSet | None = None,
         class_prefix: str = "markdown-alert",
         *,
         parse_nested: bool = True,
@@ -40,7 +239,9 @@ class AlertRuleFactory:
         self.titles = titles
         if icons is None:
             icons = {}
-        self.icons = icons
+        elif isinstance(icons, str):
+            icons = load_icon_set(icons)
+        self.icons: Mapping[str, str] = icons
 
         self.class_prefix = class_prefix
         self.parse_nested = parse_nested
@@ -66,42 +267,140 @@ class AlertRuleFactory:
             ),
         ]
 
-    @staticmethod
-    def _get_first_inline(tokens: list[Token], start: int, end: int) -> Token | None:
-        return next(
-            (t for t in tokens[start : end + 1] if t.type == "inline"),
-            None,
+    @cached_property
+    def _patterns_by_lead(self) -> dict[str, tuple[tuple[int, re.Pattern[str]], ...]]:
+        r"""Index `patterns` by the leading character each one requires.
+
+        Both patterns are anchored on a literal that case-folding can't change (`*` for the legacy syntax, `[` or
+        `\` for the canonical one), so a single lookup on the first character selects the only pattern that
+        could match. Most blockquotes start with prose and skip the regexes entirely.
+
+        """
+        legacy, canonical = self.patterns
+        return {
+            "*": ((0, legacy),),
+            "[": ((1, canonical),),
+            "\\": ((1, canonical),),
+        }
+
+    @cached_property
+    def _legacy_markers(self) -> tuple[str, ...]:
+        """Substrings the source must contain (lowercased unless case sensitive) for the legacy pattern to match.
+
+        The needles stop before the `i` in "Warning" because IGNORECASE also lets U+0130 and U+0131 (the Turkish
+        dotted and dotless I) match it, which `str.lower` would miss.
+
+        """
+        if self.match_case_sensitive:
+            return ("**Note", "**Warning")
+        return ("**note", "**warn")
+
+    def _may_contain_alert(self, src: str) -> bool:
+        r"""Cheap source-level check so documents without any marker skip the token walk entirely.
+
+        `[!` also covers the escaped `\[!` form and custom titles, which only follow the marker.
+
+        """
+        if "[!" in src:
+            return True
+        if "**" not in src:
+            return False
+        folded = src if self.match_case_sensitive else src.lower()
+        return any(marker in folded for marker in self._legacy_markers)
+
+    @cached_property
+    def _openings(self) -> dict[tuple[str, str], tuple[str, str]]:
+        """Opening HTML by `(title, icon)`: the prefix up to the title text, and the full opening with the default title.
+
+        Prefilled for each configured title in the spellings sources usually use. Wildcard titles and other
+        spellings (the patterns ignore case by default) are built on first use.
+
+        """
+        titles = [] if self.titles == ["*"] else [*self.titles, *_LEGACY_TITLES]
+        openings = {}
+        for title in titles:
+            for spelling in {title, title.upper(), title.lower(), title.title()}:
+                icon = self.icons.get(spelling.lower(), "")
+                openings[spelling, icon] = self._build_opening(spelling, icon)
+        return openings
+
+    def _build_opening(self, title: str, icon: str) -> tuple[str, str]:
+        prefix = (
+            f'<div class="{self.class_prefix} {self.class_prefix}-{title.lower()}">\n'
+            f'<p class="{self.class_prefix}-title">{icon}'
         )
+        return prefix, f"{prefix}{title.title()}</p>\n"
+
+    def opening_html(self, title: str, icon: str) -> tuple[str, str]:
+        """The `(prefix, default)` opening HTML of an alert, where `prefix` only needs a custom title and `</p>`."""
+        key = (title, icon)
+        if (opening := self._openings.get(key)) is None:
+            opening = self._build_opening(title, icon)
+            if len(self._openings) < _MAX_BUILT_OPENINGS:
+                self._openings[key] = opening
+        return opening
+
+    def _match_marker(
+        self, content: str, stats: _stats.AlertStats | None = None
+    ) -> tuple[int, re.Match[str]] | None:
+        for pattern_index, pattern in self._patterns_by_lead.get(content[:1], ()):
+            if stats is not None:
+                stats.pattern_attempts[_stats.PATTERN_NAMES[pattern_index]] += 1
+            if match := pattern.match(content):
+                return pattern_index, match
+        return None
 
     @staticmethod
-    def _get_first_inline_index(tokens: list[Token], start: int, end: int) -> int:
+    def _get_first_inline_index(
+        tokens: list[Token], start: int, end: int, dropped: Container[int] = ()
+    ) -> int:
         for index in range(start, end + 1):
-            if tokens[index].type == "inline":
+            if tokens[index].type == "inline" and index not in dropped:
                 return index
         return -1
 
+    @staticmethod
+    def _drop_paragraphs(tokens: list[Token], dropped: Iterable[int]) -> list[int]:
+        """Remove the paragraph around each inline in `dropped`, rebuilding `tokens` once.
+
+        Returns the new index of every kept token by its old one, plus a trailing -1 so a missing index maps to
+        itself.
+
+        """
+        keep = bytearray(b"\x01") * len(tokens)
+        for index in dropped:
+            keep[index - 1 : index + 2] = b"\x00\x00\x00"
+        positions = list(accumulate(keep, initial=0))
+        positions[-1] = -1
+        tokens[:] = compress(tokens, keep)
+        return positions
+
     def _block_to_alerts_if_matched(
         self,
         tokens: list[Token],
         start_index: int,
         end_index: int,
+        inline_index: int,
         *,
         custom_title: bool,
-    ) -> int:
-        first_inline = self._get_first_inline(tokens, start_index, end_index)
-        if not first_inline:
-            return 0
+        stats: _stats.AlertStats | None = None,
+    ) -> bool:
+        """Convert the blockquote to an alert if its first inline starts with a marker.
 
-        match_index = -1
-        match = None
-        for pattern_index, pattern in enumerate(self.patterns):
-            match = pattern.match(first_inline.content)
-            if match:
-                match_index = pattern_index
-                break
+        Returns whether the alert's leading paragraph was left empty and should be dropped. Removing it is up to
+        the caller, so a walk over the whole token stream can drop every such paragraph in a single pass.
 
-        if not match:
-            return 0
+        """
+        if inline_index == -1:
+            return False
+        first_inline = tokens[inline_index]
+
+        matched = self._match_marker(first_inline.content, stats)
+        if not matched:
+            return False
+        match_index, match = matched
+        if stats is not None:
+            stats.matches += 1
 
         title = match.group("title").strip()
         icon = self.icons.get(title.lower(), "")
@@ -129,103 +428,575 @@ class AlertRuleFactory:
 
         open_token.type = GFM_ALERT_OPEN
         open_token.tag = "div"
-        open_token.meta = {
-            "title": title,
-            "icon": icon,
-            "inline_title": inline_title,
-        }
+        # Titles and icons repeat across a document, so interning shares one string per spelling
+        open_token.meta = AlertMeta(  # type: ignore[assignment]
+            sys.intern(title), sys.intern(icon), inline_title
+        )
 
         close_token.type = GFM_ALERT_CLOSE
         close_token.tag = "div"
 
         # An empty leading paragraph would render as a stray `<p></p>` next to the title. Drop it so downstream
         # renderers don't have to filter empty paragraphs out of every alert.
-        if is_canonical_unescaped and not first_inline.content:
-            inline_index = self._get_first_inline_index(tokens, start_index, end_index)
-            if (
-                inline_index > 0
-                and tokens[inline_index - 1].type == "paragraph_open"
-                and inline_index + 1 <= end_index
-                and tokens[inline_index + 1].type == "paragraph_close"
+        if (
+            is_canonical_unescaped
+            and not first_inline.content
+            and tokens[inline_index - 1].type == "paragraph_open"
+            and inline_index + 1 <= end_index
+            and tokens[inline_index + 1].type == "paragraph_close"
+        ):
+            if stats is not None:
+                stats.empty_paragraphs_removed += 1
+            return True
+        return False
+
+    def _reassign_first_inline(
+        self,
+        tokens: list[Token],
+        stack: list[int],
+        first_inlines: list[int],
+        removed_index: int,
+        *,
+        end_index: int,
+        dropped: Container[int],
+    ) -> int:
+        """Point enclosing blockquotes past a dropped paragraph that was also their first inline.
+
+        Those blockquotes are the top rows of the stack. The next inline (if any) is the first one after the
+        dropped paragraph that isn't itself dropped, and any still without one go back to pending. Returns how
+        many did.
+
+        """
+        sharing = 0
+        while (
+            sharing < len(stack) and first_inlines[stack[-1 - sharing]] == removed_index
+        ):
+            sharing += 1
+        if not sharing:
+            return 0
+        next_index = self._get_first_inline_index(
+            tokens, removed_index + 2, end_index, dropped
+        )
+        for row in stack[len(stack) - sharing :]:
+            first_inlines[row] = next_index
+        return sharing if next_index == -1 else 0
+
+    def _convert_blockquotes(
+        self,
+        tokens: list[Token],
+        *,
+        custom_title: bool,
+        stats: _stats.AlertStats | None = None,
+    ) -> BlockquoteIndex | None:
+        """Convert every matching blockquote, returning the index of all of them when it was built on the way."""
+        if not self.parse_nested:
+            self._convert_outermost_blockquotes(
+                tokens, custom_title=custom_title, stats=stats
+            )
+            return None
+
+        # Each blockquote is a row of the `BlockquoteIndex` columns, and the stack holds the rows still open. An
+        # inline token is the first inline of every enclosing blockquote that hasn't seen one yet, and those are
+        # always the top `pending` rows of the stack, so each row is resolved exactly once and the scan stays
+        # O(tokens). Dropped paragraphs are only recorded during the scan (deleting each one would shift the rest
+        # of the stream), and removed together at the end.
+        opens: list[int] = []
+        closes: list[int] = []
+        first_inlines: list[int] = []
+        stack: list[int] = []
+        pending = 0
+        dropped: set[int] = set()
+        for i, token in enumerate(tokens):
+            if token.type == "blockquote_open":
+                stack.append(len(opens))
+                opens.append(i)
+                closes.append(-1)
+                first_inlines.append(-1)
+                pending += 1
+            elif token.type == "inline":
+                while pending:
+                    first_inlines[stack[-pending]] = i
+                    pending -= 1
+            elif token.type == "blockquote_close":
+                row = stack.pop()
+                closes[row] = i
+                inline_index = first_inlines[row]
+                if inline_index == -1:
+                    pending -= 1
+                if stats is not None:
+                    stats.blockquotes_scanned += 1
+                if self._block_to_alerts_if_matched(
+                    tokens,
+                    opens[row],
+                    end_index=i,
+                    inline_index=inline_index,
+                    custom_title=custom_title,
+                    stats=stats,
+                ):
+                    dropped.add(inline_index)
+                    pending += self._reassign_first_inline(
+                        tokens,
+                        stack,
+                        first_inlines,
+                        inline_index,
+                        end_index=i,
+                        dropped=dropped,
+                    )
+        return self._drop_and_index(tokens, dropped, opens, closes, first_inlines)
+
+    def _drop_and_index(
+        self,
+        tokens: list[Token],
+        dropped: set[int],
+        opens: list[int],
+        closes: list[int],
+        first_inlines: list[int],
+    ) -> BlockquoteIndex:
+        """Drop the paragraphs around `dropped` inlines, then index the blockquotes in the tokens that remain."""
+        if dropped:
+            # A row can still point at a dropped inline: its alert's own, or one an enclosing alert dropped later
+            for row, first_inline in enumerate(first_inlines):
+                if first_inline in dropped:
+                    first_inlines[row] = (
+                        -1  # a title-only alert closes right after its paragraph
+                        if first_inline + 2 == closes[row]
+                        else self._get_first_inline_index(
+                            tokens, first_inline + 2, closes[row], dropped
+                        )
+                    )
+            positions = self._drop_paragraphs(tokens, dropped)
+            opens, closes, first_inlines = (
+                list(map(positions.__getitem__, column))
+                for column in (opens, closes, first_inlines)
+            )
+        return BlockquoteIndex.from_columns(tokens, opens, closes, first_inlines)
+
+    def _convert_outermost_blockquotes(
+        self,
+        tokens: list[Token],
+        *,
+        custom_title: bool,
+        stats: _stats.AlertStats | None = None,
+    ) -> None:
+        # Only blockquotes outside any other can become alerts here. Every token inside one sits deeper than its
+        # `blockquote_open`, so its close is the next token back at that level: inner blockquotes need no tracking,
+        # and past the first inline each token costs a single level comparison.
+        dropped: set[int] = set()
+        i = 0
+        while i < len(tokens):
+            if tokens[i].type != "blockquote_open":
+                i += 1
+                continue
+            start_index = i
+            level = tokens[i].level
+            i += 1
+            inline_index = -1
+            while tokens[i].level > level:
+                if tokens[i].type == "inline":
+                    inline_index = i
+                    break
+                i += 1
+            while tokens[i].level > level:
+                i += 1
+
+            if stats is not None:
+                stats.blockquotes_scanned += 1
+            if self._block_to_alerts_if_matched(
+                tokens,
+                start_index,
+                end_index=i,
+                inline_index=inline_index,
+                custom_title=custom_title,
+                stats=stats,
             ):
-                del tokens[inline_index - 1 : inline_index + 2]
-                return 3
-        return 0
+                dropped.add(inline_index)
+            i += 1
+        if dropped:
+            self._drop_paragraphs(tokens, dropped)
+
+    def _resolve_custom_title(self, state: StateCore | StateBlock) -> bool:
+        # Read lazily, at render time, rather than closing over a value computed when this rule was
+        # registered: mdformat runs every extension's `update_mdit` in an unguaranteed order, so a
+        # value baked in at registration time could be stale by the time a sibling extension (or the
+        # caller) finishes configuring options. By render time every extension has already registered.
+        if state.md.options.get("mdformat") is not None:
+            return bool(get_conf(state.md.options, "custom_title"))
+        return self.custom_title
+
+    def _run_instrumented(self, state: StateCore, collector: _stats.AlertStats) -> None:
+        stats = _stats.AlertStats(documents=1)
+        start = time.perf_counter()
+        may_contain_alert = self._may_contain_alert(state.src)
+        stats.add_time("prefilter", time.perf_counter() - start)
+        index = None
+        if may_contain_alert:
+            start = time.perf_counter()
+            index = self._convert_blockquotes(
+                state.tokens,
+                custom_title=self._resolve_custom_title(state),
+                stats=stats,
+            )
+            stats.add_time("scan", time.perf_counter() - start)
+        else:
+            stats.documents_skipped = 1
+        _publish_index(state.env, index)
+        _stats.record(collector, stats)
 
     def get_rule(self) -> Callable[[StateCore], None]:
         def github_alerts_rule(state: StateCore) -> None:
-            # Read lazily, at render time, rather than closing over a value computed when this rule was
-            # registered: mdformat runs every extension's `update_mdit` in an unguaranteed order, so a
-            # value baked in at registration time could be stale by the time a sibling extension (or the
-            # caller) finishes configuring options. By render time every extension has already registered.
-            mdformat_opts = state.md.options.get("mdformat")
-            custom_title = (
-                bool(get_conf(state.md.options, "custom_title"))
-                if mdformat_opts is not None
-                else self.custom_title
-            )
+            # Instrumentation is a separate path so the default one only pays for this check. Inline-mode runs
+            # (`renderInline` of a custom title) are part of the enclosing document, so they aren't counted
+            if (
+                collector := _stats.get_collector()
+            ) is not None and not state.inlineMode:
+                self._run_instrumented(state, collector)
+                return
+
+            index = None
+            if self._may_contain_alert(state.src):
+                index = self._convert_blockquotes(
+                    state.tokens, custom_title=self._resolve_custom_title(state)
+                )
+            _publish_index(state.env, index)
+
+        return github_alerts_rule
 
+    def get_block_rule(self, blockquote: RuleFuncBlockType) -> RuleFuncBlockType:
+        """Wrap markdown-it's `blockquote` block rule to convert each blockquote as soon as it is parsed.
+
+        The rule closes inner blockquotes before outer ones, the same order the core rule's walk visits them
+        in, so both engines produce the same tokens. Any dropped empty paragraph is at the tail of the token
+        list at that point, and no second pass over the stream is needed. Each blockquote reports its first
+        inline to the one enclosing it, so finding an outer blockquote's first inline skips over the inner ones
+        instead of rescanning them, which would cost quadratic time in the nesting depth.
+
+        """
+        # One entry per blockquote being parsed: its token list, and the opening index of each inner blockquote
+        # closed so far mapped to that one's first inline and closing index
+        levels = threading.local()
+
+        def gfm_alerts_blockquote(
+            state: StateBlock, start_line: int, end_line: int, silent: bool
+        ) -> bool:
+            if silent:
+                return blockquote(state, start_line, end_line, silent)
             tokens = state.tokens
-            i = 0
-            start_indices = []
-            while i < len(tokens):
-                if tokens[i].type == "blockquote_open":
-                    start_indices.append(i)
-                elif tokens[i].type == "blockquote_close":
-                    start_index = start_indices.pop()
-                    if self.parse_nested or not start_indices:
-                        removed = self._block_to_alerts_if_matched(
-                            tokens,
-                            start_index,
-                            end_index=i,
-                            custom_title=custom_title,
-                        )
-                        # Rewind past any deletions so the outer cursor stays aligned with the token list.
-                        i -= removed
-                i += 1
+            start_index = len(tokens)
+            stack: list[tuple[list[Token], dict[int, tuple[int, int]]]] = (
+                levels.__dict__.setdefault("stack", [])
+            )
+            stack.append((tokens, {}))
+            try:
+                found = blockquote(state, start_line, end_line, silent)
+            finally:
+                _, inner = stack.pop()
+            if found:
+                first_inline = self._convert_parsed_blockquote(
+                    state, start_index, inner
+                )
+                # A plugin may parse a nested document into its own token list, which the enclosing scan never sees
+                if stack and stack[-1][0] is tokens:
+                    stack[-1][1][start_index] = (first_inline, len(tokens) - 1)
+            return found
+
+        if self.parse_nested:
+            return gfm_alerts_blockquote
+
+        # Without nested parsing, blockquotes inside one still being parsed are left alone
+        enclosing = threading.local()
+
+        def outermost_blockquote(
+            state: StateBlock, start_line: int, end_line: int, silent: bool
+        ) -> bool:
+            if silent or getattr(enclosing, "active", False):
+                return blockquote(state, start_line, end_line, silent)
+            enclosing.active = True
+            try:
+                return gfm_alerts_blockquote(state, start_line, end_line, silent)
+            finally:
+                enclosing.active = False
+
+        return outermost_blockquote
+
+    def _convert_parsed_blockquote(
+        self, state: StateBlock, start_index: int, inner: Mapping[int, tuple[int, int]]
+    ) -> int:
+        if (collector := _stats.get_collector()) is None:
+            return self._convert_last_blockquote(state, start_index, inner)
 
-        return github_alerts_rule
+        # Blockquotes are recorded one at a time, so this engine doesn't count documents
+        stats = _stats.AlertStats(blockquotes_scanned=1)
+        start = time.perf_counter()
+        first_inline = self._convert_last_blockquote(state, start_index, inner, stats)
+        stats.add_time("scan", time.perf_counter() - start)
+        _stats.record(collector, stats)
+        return first_inline
+
+    @staticmethod
+    def _get_first_inline_index_past(
+        tokens: list[Token], start: int, end: int, inner: Mapping[int, tuple[int, int]]
+    ) -> int:
+        """Like `_get_first_inline_index`, but take each inner blockquote's first inline from `inner`."""
+        index = start
+        while index <= end:
+            if tokens[index].type == "inline":
+                return index
+            if (converted := inner.get(index)) is None:
+                index += 1
+                continue
+            first_inline, close_index = converted
+            if first_inline != -1:
+                return first_inline
+            index = close_index + 1
+        return -1
+
+    def _convert_last_blockquote(
+        self,
+        state: StateBlock,
+        start_index: int,
+        inner: Mapping[int, tuple[int, int]],
+        stats: _stats.AlertStats | None = None,
+    ) -> int:
+        """Convert the blockquote that was just parsed, and return its first inline afterwards (or -1)."""
+        tokens = state.tokens
+        end_index = len(tokens) - 1
+        # Inner alerts already dropped their empty paragraphs, so the first inline is simply the next one left
+        inline_index = self._get_first_inline_index_past(
+            tokens, start_index + 1, end_index, inner
+        )
+        # Most blockquotes aren't alerts, so rule those out before reading the options
+        if (
+            inline_index == -1
+            or tokens[inline_index].content[:1] not in self._patterns_by_lead
+        ):
+            return inline_index
+        if not self._block_to_alerts_if_matched(
+            tokens,
+            start_index,
+            end_index,
+            inline_index,
+            custom_title=self._resolve_custom_title(state),
+            stats=stats,
+        ):
+            return inline_index
+        next_inline = self._get_first_inline_index_past(
+            tokens, inline_index + 2, end_index, inner
+        )
+        # Only this blockquote's own tokens follow its first paragraph, so deleting in place stays cheap
+        del tokens[inline_index - 1 : inline_index + 2]
+        return -1 if next_inline == -1 else next_inline - 3
+
+
+class _FactoryCache:
+    """Process-wide LRU of configured `AlertRuleFactory` instances.
+
+    `mdformat.text` builds a fresh `MarkdownIt` per call, so without this every document would recompile the same
+    patterns. Unbounded by default since most processes only ever see one configuration.
+
+    """
+
+    def __init__(self, maxsize: int | None = None) -> None:
+        self.maxsize = maxsize
+        self._factories: OrderedDict[Hashable, AlertRuleFactory] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def get(
+        self,
+        titles: list[str] | None,
+        icons: Mapping[str, str] | IconSet | None,
+        class_prefix: str,
+        *,
+        parse_nested: bool,
+        match_case_sensitive: bool,
+        custom_title: bool,
+    ) -> AlertRuleFactory:
+        titles = DEFAULT_TITLES if titles is None else titles
+        icons = {} if icons is None else icons
+        # A built-in set is keyed by its name and passed on by name, so factories share its one loaded copy
+        key = (
+            tuple(titles),
+            icons if isinstance(icons, str) else tuple(sorted(icons.items())),
+            class_prefix,
+            parse_nested,
+            match_case_sensitive,
+            custom_title,
+        )
+        with self._lock:
+            if (factory := self._factories.get(key)) is not None:
+                self._factories.move_to_end(key)
+                return factory
+
+        # Copy the mutable arguments so a caller editing theirs later can't desync a shared factory from its key
+        factory = AlertRuleFactory(
+            titles=list(titles),
+            icons=icons if isinstance(icons, str) else dict(icons),
+            class_prefix=class_prefix,
+            parse_nested=parse_nested,
+            match_case_sensitive=match_case_sensitive,
+            custom_title=custom_title,
+        )
+        # Compile and prerender outside the lock
+        _ = factory.patterns
+        _ = factory._openings  # ruff: ignore[private-member-access]
+        with self._lock:
+            factory = self._factories.setdefault(key, factory)
+            self._evict()
+        return factory
+
+    def resize(self, maxsize: int | None) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._factories.clear()
+
+    def _evict(self) -> None:
+        if self.maxsize is not None:
+            while len(self._factories) > self.maxsize:
+                self._factories.popitem(last=False)
+
+
+_FACTORY_CACHE = _FactoryCache()
+
+
+def configure_factory_cache(maxsize: int | None) -> None:
+    """Bound the shared factory cache to `maxsize` configurations (`None` for unbounded).
+
+    Use a bound in long-running applications that build many distinct `titles`/`icons` combinations.
+
+    Raises:
+        ValueError: if `maxsize` is negative
+
+    """
+    if maxsize is not None and maxsize < 0:
+        msg = f"maxsize must be None or non-negative, not {maxsize}"
+        raise ValueError(msg)
+    _FACTORY_CACHE.resize(maxsize)
+
+
+def clear_factory_cache() -> None:
+    """Drop every shared factory, e.g. between tests."""
+    _FACTORY_CACHE.clear()
+
+
+DEFAULT_INLINE_TITLE_CACHE_SIZE = 256
+
+# The `MarkdownIt` options that change how inline markdown renders, so cached titles are keyed on their values
+_INLINE_OPTIONS = ("html", "xhtmlOut", "breaks", "linkify", "typographer", "quotes")
+
+
+def _inline_options_key(options: Mapping[str, Any]) -> tuple[Any, ...]:
+    # `quotes` may be a list, which isn't hashable
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in map(options.get, _INLINE_OPTIONS)
+    )
+
+
+# Keyed weakly so a cache lives exactly as long as its `MarkdownIt`. Each cache holds only a weak reference back,
+# since a value referencing its own key would keep the entry alive forever.
+_INLINE_TITLE_CACHES: weakref.WeakKeyDictionary[MarkdownIt, _lru_cache_wrapper[str]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _inline_title_renderer(md: MarkdownIt, maxsize: int) -> _lru_cache_wrapper[str]:
+    """LRU of `md.renderInline` results, since documents tend to reuse a handful of custom titles.
+
+    Scoped to `md` so cached HTML always reflects that instance's rules, and keyed on its inline options too
+    (`options_key`, from `_inline_options_key`), since those can change after the first render.
+
+    """
+    md_ref = weakref.ref(md)
+
+    @lru_cache(maxsize=maxsize)
+    def render_inline_title(
+        inline_title: str,
+        options_key: tuple[Any, ...],  # ruff: ignore[unused-function-argument]
+    ) -> str:
+        instance = md_ref()
+        assert instance is not None  # only called while rendering with `md`
+        return instance.renderInline(inline_title)
+
+    _INLINE_TITLE_CACHES[md] = render_inline_title
+    return render_inline_title
+
+
+def inline_title_cache_info(md: MarkdownIt) -> _CacheInfo | None:
+    """Hits, misses, and size of `md`'s rendered inline title cache, or None if the plugin isn't on `md`.
+
+    Use it to size `inline_title_cache_size`: many misses with a full cache mean it's too small.
+
+    """
+    if (render_inline_title := _INLINE_TITLE_CACHES.get(md)) is None:
+        return None
+    return render_inline_title.cache_info()
 
 
 def gfm_alerts_plugin(
     md: MarkdownIt,
     titles: list[str] | None = None,
-    icons: dict[str, str] | None = None,
+    icons: Mapping[str, str] | IconSet | None = None,
     class_prefix: str = "markdown-alert",
     *,
     parse_nested: bool = True,
     match_case_sensitive: bool = False,
     custom_title: bool = False,
+    inline_title_cache_size: int = DEFAULT_INLINE_TITLE_CACHE_SIZE,
+    engine: Engine = "core",
 ) -> None:
-    github_alerts_rule = AlertRuleFactory(
+    """Render GitHub alerts as `<div>`s. See the README for the options.
+
+    Raises:
+        ValueError: if `inline_title_cache_size` is negative, or `engine` or a named `icons` set is unknown
+
+    """
+    if inline_title_cache_size < 0:
+        msg = f"inline_title_cache_size must be non-negative, not {inline_title_cache_size}"
+        raise ValueError(msg)
+    if engine not in ENGINES:
+        msg = f"engine must be one of {ENGINES}, not {engine!r}"
+        raise ValueError(msg)
+
+    factory = _FACTORY_CACHE.get(
         titles=titles,
         icons=icons,
         class_prefix=class_prefix,
         parse_nested=parse_nested,
         match_case_sensitive=match_case_sensitive,
         custom_title=custom_title,
-    ).get_rule()
+    )
 
-    md.core.ruler.after("block", GFM_ALERTS_PREFIX, github_alerts_rule)
+    if engine == "block":
+        (blockquote,) = (
+            rule for rule in md.block.ruler.__rules__ if rule.name == "blockquote"
+        )
+        md.block.ruler.at(
+            "blockquote", factory.get_block_rule(blockquote.fn), {"alt": blockquote.alt}
+        )
+    else:
+        md.core.ruler.after("block", GFM_ALERTS_PREFIX, factory.get_rule())
+    render_inline_title = _inline_title_renderer(md, inline_title_cache_size)
 
     def render_alert_open(
         self: RendererProtocol,  # ruff: ignore[unused-function-argument]
         tokens: list[Token],
         idx: int,
-        options,  # ruff: ignore[missing-type-function-argument, unused-function-argument]
+        options,  # ruff: ignore[missing-type-function-argument]
         env,  # ruff: ignore[missing-type-function-argument, unused-function-argument]
     ) -> str:
         meta = tokens[idx].meta
+        prefix, default = factory.opening_html(meta["title"], meta["icon"])
         inline_title = meta.get("inline_title", "")
         if inline_title:
-            title_html = md.renderInline(inline_title)
-        else:
-            title_html = meta["title"].title()
-        return (
-            f'<div class="{class_prefix} {class_prefix}-{meta["title"].lower()}">\n'
-            f'<p class="{class_prefix}-title">'
-            f"{meta['icon']}{title_html}</p>\n"
-        )
+            title_html = render_inline_title(inline_title, _inline_options_key(options))
+            return f"{prefix}{title_html}</p>\n"
+        return default
 
     def render_alert_close(
         self: RendererProtocol,  # ruff: ignore[unused-function-argument]
@@ -2,41 +2,91 @@
 
 from __future__ import annotations
 
-import argparse
 from collections.abc import Mapping
+from itertools import dropwhile
 
 from markdown_it import MarkdownIt
 from mdformat.renderer import RenderContext, RenderTreeNode
 from mdformat.renderer.typing import Render
 
+from . import stats
 from .mdit_plugins import GFM_ALERTS_PREFIX, gfm_alerts_plugin
 
+# Leaves that render to whitespace regardless of their content
+_BLANK_LEAVES = frozenset({"softbreak"})
+# Leaves that render to whitespace exactly when their content is blank (an `inline` without children is empty)
+_TEXT_LEAVES = frozenset({"inline", "text"})
+_LISTS = frozenset({"bullet_list", "ordered_list"})
+# Blocks skipped while empty at the start of an alert (the emptied marker paragraph among them), since directly
+# after the marker line an empty item or heading would re-parse as a setext underline or a lazy continuation
+_DROPPED_WHEN_LEADING = _LISTS | {"heading", "paragraph"}
 
-def add_cli_argument_group(group: argparse._ArgumentGroup) -> None:
-    """Add options to the mdformat CLI.
 
-    Stored in `mdit.options["mdformat"]["plugin"]["gfm_alerts"]`
+def update_mdit(mdit: MarkdownIt) -> None:
+    """Update the parser to identify Alerts."""
+    mdit.use(gfm_alerts_plugin)
+
+
+def _is_visible(node: RenderTreeNode) -> bool:
+    """Whether any leaf in this block would render to visible markdown.
+
+    Decided from the tokens rather than by rendering each leaf, so the body is rendered exactly once. Containers
+    never count on their own: an empty list item or heading after the marker line would re-parse as a setext
+    underline or a lazy continuation. A nested alert always counts, since its marker is content.
 
     """
-    group.add_argument(
-        "--custom-title",
-        action="store_const",
-        const=True,
-        help=(
-            "Preserve an inline custom title on the canonical `[!TYPE]` line. "
-            "This convention comes from Obsidian's callout spec (Hugo's alert "
-            "syntax mirrors it). It's not part of GitHub's own GFM alerts spec, "
-            "so it's off by default."
-        ),
+    for inner_node in node.walk():
+        if inner_node.type == GFM_ALERTS_PREFIX:
+            return True
+        if (
+            inner_node.children
+            or inner_node.is_nested
+            or inner_node.type in _BLANK_LEAVES
+        ):
+            continue
+        if inner_node.type not in _TEXT_LEAVES or inner_node.content.strip():
+            return True
+    return False
+
+
+def _without_leading_empty_blocks(
+    children: list[RenderTreeNode],
+) -> list[RenderTreeNode]:
+    """Skip the empty lists, list items, and headings that would be written directly after the marker line."""
+    body = list(
+        dropwhile(
+            lambda child: (
+                child.type in _DROPPED_WHEN_LEADING and not _is_visible(child)
+            ),
+            children,
+        )
     )
+    if body and body[0].type in _LISTS:
+        # The list has a visible item, so at least one remains
+        body[0].children = list(
+            dropwhile(lambda item: not _is_visible(item), body[0].children)
+        )
+    return body
 
 
-def update_mdit(mdit: MarkdownIt) -> None:
-    """Update the parser to identify Alerts."""
-    mdit.use(gfm_alerts_plugin)
+def _interrupts_paragraph(block: RenderTreeNode) -> bool:
+    """Whether `block` would start a new block directly after the marker line instead of continuing it.
+
+    Only an ordered list starting at 1 (or any bullet list) may interrupt a paragraph; any other ordered list would
+    re-parse as a lazy continuation of the marker line.
+
+    """
+    return block.type != "ordered_list" or block.attrs.get("start", 1) == 1
 
 
 def _render_alert(node: RenderTreeNode, context: RenderContext) -> str:
+    if (collector := stats.get_collector()) is not None:
+        with stats.rendering_alert(collector):
+            return _render_alert_body(node, context)
+    return _render_alert_body(node, context)
+
+
+def _render_alert_body(node: RenderTreeNode, context: RenderContext) -> str:
     if node.nester_tokens is not None:
         open_token = node.nester_tokens.opening
         close_token = node.nester_tokens.closing
@@ -49,16 +99,15 @@ def _render_alert(node: RenderTreeNode, context: RenderContext) -> str:
 
         open_token.type = "blockquote_open"
         open_token.tag = "blockquote"
-        open_token.meta = {}
 
         close_token.type = "blockquote_close"
         close_token.tag = "blockquote"
 
-        # checking if inner node has non empty renderable
-        for inner_node in node.walk(include_self=False):
-            if not inner_node.is_nested and inner_node.render(context=context).strip():
-                result += "\n" + node.render(context=context).lstrip()
-                break
+        body = _without_leading_empty_blocks(node.children)
+        if any(_is_visible(child) for child in body):
+            node.children = body
+            separator = "\n" if _interrupts_paragraph(body[0]) else "\n>\n"
+            result += separator + node.render(context=context).lstrip()
         return result
     raise ValueError("Alert node should have nester tokens.")
 
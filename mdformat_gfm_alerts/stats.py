@@ -0,0 +1,155 @@
+"""Opt-in counters and timings for the alert core rule and renderer.
+
+Collection is off by default: the rule and renderer only check once per document (and once per rendered alert)
+whether a collector is installed. Enable it around a batch run and dump the totals afterwards::
+
+    with collect_stats() as stats:
+        formatted = list(format_many(texts))
+    dump_stats(stats)
+
+For the mdformat CLI, set `MDFORMAT_GFM_ALERTS_STATS=1` to print the totals to stderr at exit.
+
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from typing import TextIO
+
+PATTERN_NAMES = ("legacy", "canonical")
+"""Names for `AlertRuleFactory.patterns`, in order."""
+
+
+@dataclass
+class AlertStats:
+    """Totals collected while enabled. `seconds` is keyed by stage: "prefilter", "scan", and "render"."""
+
+    documents: int = 0
+    documents_skipped: int = 0
+    blockquotes_scanned: int = 0
+    pattern_attempts: dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(PATTERN_NAMES, 0)
+    )
+    matches: int = 0
+    empty_paragraphs_removed: int = 0
+    alerts_rendered: int = 0
+    seconds: dict[str, float] = field(default_factory=dict)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add `seconds` to `stage`."""
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def merge(self, other: AlertStats) -> None:
+        """Add every total of `other` into this one."""
+        for stat in fields(self):
+            value = getattr(other, stat.name)
+            if isinstance(value, dict):
+                totals = getattr(self, stat.name)
+                for key, count in value.items():
+                    totals[key] = totals.get(key, 0) + count
+            else:
+                setattr(self, stat.name, getattr(self, stat.name) + value)
+
+    def report(self) -> str:
+        """Human-readable summary, one total per line."""
+        lines = [
+            f"documents: {self.documents} ({self.documents_skipped} skipped without markers)",
+            f"blockquotes scanned: {self.blockquotes_scanned}",
+            *(
+                f"regex attempts ({name}): {count}"
+                for name, count in self.pattern_attempts.items()
+            ),
+            f"matches: {self.matches}",
+            f"empty paragraphs removed: {self.empty_paragraphs_removed}",
+            f"alerts rendered: {self.alerts_rendered}",
+            *(
+                f"time in {stage}: {seconds * 1e3:.3f} ms"
+                for stage, seconds in self.seconds.items()
+            ),
+        ]
+        return "\n".join(lines)
+
+
+_collector: AlertStats | None = None
+_lock = threading.Lock()
+# Nested alerts render inside their parent, so only the outermost call in each thread is timed
+_render_depth = threading.local()
+
+
+def get_collector() -> AlertStats | None:
+    """The installed collector, or None while collection is off."""
+    return _collector
+
+
+def enable_stats() -> AlertStats:
+    """Start collecting into a fresh `AlertStats` and return it."""
+    global _collector  # ruff: ignore[global-statement]
+    _collector = AlertStats()
+    return _collector
+
+
+def disable_stats() -> AlertStats | None:
+    """Stop collecting and return the totals, if collection was on."""
+    global _collector
+    collector, _collector = _collector, None
+    return collector
+
+
+@contextmanager
+def collect_stats() -> Generator[AlertStats, None, None]:
+    """Collect totals for the duration of the block.
+
+    Any collector that was already installed (by an enclosing block or `MDFORMAT_GFM_ALERTS_STATS`) is restored
+    afterwards, with the block's totals merged into it.
+
+    """
+    global _collector  # ruff: ignore[global-statement]
+    previous = _collector
+    stats = enable_stats()
+    try:
+        yield stats
+    finally:
+        _collector = previous
+        if previous is not None:
+            record(previous, stats)
+
+
+def dump_stats(stats: AlertStats | None = None, file: TextIO | None = None) -> None:
+    """Print `stats` (default: the installed collector) to `file` (default: stderr)."""
+    stats = stats or _collector
+    if stats is not None:
+        print(stats.report(), file=file or sys.stderr)
+
+
+def record(collector: AlertStats, stats: AlertStats) -> None:
+    """Merge one document's totals into `collector`."""
+    with _lock:
+        collector.merge(stats)
+
+
+@contextmanager
+def rendering_alert(collector: AlertStats) -> Generator[None, None, None]:
+    """Count one rendered alert, timing it unless it is nested in another."""
+    depth = getattr(_render_depth, "value", 0)
+    _render_depth.value = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _render_depth.value = depth
+        stats = AlertStats(alerts_rendered=1)
+        if not depth:
+            stats.add_time("render", time.perf_counter() - start)
+        record(collector, stats)
+
+
+if os.environ.get("MDFORMAT_GFM_ALERTS_STATS"):
+    enable_stats()
+    atexit.register(dump_stats)
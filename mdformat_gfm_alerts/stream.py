@@ -0,0 +1,240 @@
+"""Format Markdown files too large to hold in memory, a few top-level blocks at a time."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+from markdown_it import MarkdownIt
+from markdown_it.rules_core import StateCore, block, normalize
+from markdown_it.token import Token
+
+# Same internals as `batch`, so each chunk is formatted exactly like `mdformat.text` would
+from mdformat._conf import DEFAULT_OPTS  # ruff: ignore[import-private-name]
+from mdformat._util import build_mdit  # ruff: ignore[import-private-name]
+from mdformat.renderer import MDRenderer
+
+from .batch import FormatterConfig
+
+DEFAULT_CHUNK_LINES = 1_000
+
+# mdformat alternates the markers of adjacent lists so they don't merge, which it decides from the previous sibling
+_LIST_TYPES = frozenset({"bullet_list_open", "ordered_list_open"})
+
+_Parse = Callable[[str, MutableMapping[str, Any]], list[Token]]
+
+
+class _StreamRenderer(MDRenderer):
+    """`MDRenderer` that keeps `used_refs` across calls, so chunks escape and collect references as one document."""
+
+    def _prepare_env(self, env: MutableMapping[str, Any]) -> None:
+        used_refs = env.get("used_refs", set())
+        super()._prepare_env(env)
+        env["used_refs"] = used_refs
+
+    def render_chunk(
+        self,
+        tokens: list[Token],
+        options: Mapping[str, Any],
+        env: MutableMapping[str, Any],
+    ) -> str:
+        """Render blocks without the trailing references and newline, which are written once at the end."""
+        return self.render(tokens, options, env, finalize=False)
+
+    def render_references(self, env: MutableMapping[str, Any]) -> str:
+        """The definitions of every reference used so far, as `mdformat.text` appends them."""
+        return self._write_references(env)
+
+
+def _parse_blocks(
+    mdit: MarkdownIt, src: str, env: MutableMapping[str, Any]
+) -> list[Token]:
+    """Run only the block stage, which is all that's needed to find references and block boundaries."""
+    state = StateCore(src, mdit, env)
+    normalize(state)
+    block(state)
+    return state.tokens
+
+
+def _safe_split(tokens: list[Token]) -> tuple[int, int] | None:
+    """Token index and source line of the last top-level block that later lines can't affect what precedes.
+
+    The last block itself may still grow (a lazy continuation, a setext underline, another list item), so it
+    always stays buffered. So does a list before it, since the last block might still turn out to be a link
+    reference definition, leaving that list next to whatever comes after. A buffer never starts with a thematic
+    break, which front matter extensions would read as an opening `---`.
+
+    """
+    starts = [
+        (index, token.map[0])
+        for index, token in enumerate(tokens)
+        if token.level == 0 and token.nesting != -1 and token.map is not None
+    ]
+    while len(starts) > 1 and (
+        tokens[starts[-1][0]].type == "hr" or tokens[starts[-2][0]].type in _LIST_TYPES
+    ):
+        starts.pop()
+    return starts[-1] if len(starts) > 1 else None
+
+
+def _completed_blocks(
+    lines: Iterable[str],
+    parse: _Parse,
+    new_env: Callable[[], MutableMapping[str, Any]],
+    chunk_lines: int,
+) -> Iterator[tuple[list[Token], MutableMapping[str, Any]]]:
+    """Parse a bounded buffer of `lines` at a time, yielding the tokens of each run of completed blocks.
+
+    The buffer is reparsed only once it has doubled since the last split, so a single huge block costs amortized
+    linear time rather than one reparse per line.
+
+    """
+    buffer: list[str] = []
+    threshold = chunk_lines
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) < threshold:
+            continue
+        env = new_env()
+        tokens = parse("".join(buffer), env)
+        if split := _safe_split(tokens):
+            index, start_line = split
+            yield tokens[:index], env
+            del buffer[:start_line]
+        threshold = max(chunk_lines, 2 * len(buffer))
+    if buffer:
+        env = new_env()
+        yield parse("".join(buffer), env), env
+
+
+def _collect_references(
+    path: str | PathLike[str], config: FormatterConfig, chunk_lines: int
+) -> dict[str, Any]:
+    """Every link reference definition in the file, since a link may come before its definition.
+
+    Only definitions in completed blocks are kept: one still buffered might continue with a title on a later line.
+
+    """
+    references: dict[str, Any] = {}
+    with Path(path).open(encoding="utf-8") as file:
+        if not any("]:" in line for line in file):
+            return references
+        file.seek(0)
+
+        mdit = build_mdit(
+            MDRenderer,
+            mdformat_opts={**config.options, "filename": ""},
+            extensions=config.extensions,
+        )
+        mdit.options["inline_definitions"] = True
+        for tokens, _env in _completed_blocks(
+            file,
+            lambda src, env: _parse_blocks(mdit, src, env),
+            dict,
+            chunk_lines,
+        ):
+            for token in tokens:
+                if token.type == "definition":
+                    # The first definition of a label wins, as in a whole-document parse
+                    references.setdefault(
+                        token.meta["id"],
+                        {
+                            "title": token.meta["title"],
+                            "href": token.meta["url"],
+                            "map": token.map,
+                        },
+                    )
+    return references
+
+
+def _render_chunks(
+    path: str | PathLike[str],
+    mdit: MarkdownIt,
+    references: dict[str, Any],
+    used_refs: set[str],
+    chunk_lines: int,
+) -> Iterator[str]:
+    renderer: _StreamRenderer = mdit.renderer  # type: ignore[assignment]
+    with Path(path).open(encoding="utf-8") as file:
+        for tokens, env in _completed_blocks(
+            file,
+            mdit.parse,
+            lambda: {"references": references, "used_refs": used_refs},
+            chunk_lines,
+        ):
+            if text := renderer.render_chunk(tokens, mdit.options, env):
+                yield text
+
+
+def _rerender_chunks(
+    chunks: Iterable[str],
+    mdit: MarkdownIt,
+    references: dict[str, Any],
+    used_refs: set[str],
+) -> Iterator[str]:
+    renderer: _StreamRenderer = mdit.renderer  # type: ignore[assignment]
+    for chunk in chunks:
+        env = {"references": references, "used_refs": used_refs}
+        if text := renderer.render_chunk(mdit.parse(chunk, env), mdit.options, env):
+            yield text
+
+
+def format_stream(
+    path: str | PathLike[str],
+    options: Mapping[str, Any] | None = None,
+    *,
+    extensions: Iterable[str] = (),
+    codeformatters: Iterable[str] = (),
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+) -> Iterator[str]:
+    """Format the Markdown file at `path`, yielding the output incrementally.
+
+    Joining the yielded strings gives the same result as `mdformat.text` with the `gfm_alerts` extension, but
+    memory stays bounded by `chunk_lines` and the largest top-level block rather than the whole document. The
+    file is split only between top-level blocks, never inside a blockquote, alert, or list. A top-level list is
+    one block however many items it has, since whether it's tight or loose (and, with `number`, its marker width)
+    depends on every item, so a long list is buffered whole and memory grows with it. Files containing link
+    reference definitions, which apply to the whole document, are read once more to collect them first (and once
+    more again when `wrap` isn't "keep").
+
+    Extensions that gather content from across the document (like footnotes) aren't supported.
+
+    """
+    config = FormatterConfig.from_args(options, extensions, codeformatters)
+    mdit = build_mdit(
+        _StreamRenderer,
+        mdformat_opts={**config.options, "filename": ""},
+        extensions=config.extensions,
+        codeformatters=config.codeformatters,
+    )
+    renderer: _StreamRenderer = mdit.renderer  # type: ignore[assignment]
+
+    references = _collect_references(path, config, chunk_lines)
+    used_refs: set[str] = set()
+    chunks = _render_chunks(path, mdit, references, used_refs, chunk_lines)
+    if config.options.get("wrap", DEFAULT_OPTS["wrap"]) != "keep":
+        # Like `mdformat.text`, render the output again. That output only defines the references it used anywhere,
+        # which is known once the whole first pass has run.
+        if references:
+            first_pass_refs: set[str] = set()
+            deque(
+                _render_chunks(path, mdit, references, first_pass_refs, chunk_lines),
+                maxlen=0,
+            )
+            references = {label: references[label] for label in first_pass_refs}
+        used_refs = set()
+        chunks = _rerender_chunks(chunks, mdit, references, used_refs)
+
+    separator = ""
+    for chunk in chunks:
+        yield separator + chunk
+        separator = "\n\n"
+    if used_refs:
+        env = {"references": references, "used_refs": used_refs}
+        yield separator + renderer.render_references(env)
+        separator = "\n\n"
+    if separator:
+        yield "\n"
@@ -0,0 +1,558 @@
+"""Reproducible benchmarks for the alert parsing and rendering hot paths.
+
+Each case builds its own generated corpus, so results are reproducible without
+any fixtures checked into the repo. Run every case, or name a subset::
+
+    python scripts/benchmark.py
+    python scripts/benchmark.py suite prefilter
+
+The 'suite' case times each corpus (many small alerts, one huge document, deep
+nesting, no alerts, custom titles, and a large 'titles' list) three ways:
+'gfm_alerts_plugin' HTML rendering, 'mdformat.text' round-trips, and
+'AlertRuleFactory' setup. The remaining cases are focused micro-benchmarks;
+'meta' reports memory rather than time, and is only printed.
+
+Timings are the best of several repeats, reported per call. Save them as JSON
+and compare against a run from another commit to catch regressions; the
+comparison exits non-zero when any timing is slower than '--threshold'::
+
+    python scripts/benchmark.py --output base.json
+    python scripts/benchmark.py --output head.json --compare base.json
+"""
+
+# ruff:file-ignore[import-private-name, print, private-member-access, start-process-with-partial-path]
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import sys
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import mdformat
+from markdown_it import MarkdownIt
+from markdown_it.rules_core import StateCore
+
+from mdformat_gfm_alerts import AlertRenderer, AsyncFormatter, __version__
+from mdformat_gfm_alerts.mdit_plugins import (
+    BlockquoteIndex,
+    get_blockquote_index,
+    gfm_alerts_plugin,
+)
+from mdformat_gfm_alerts.mdit_plugins._gfm_alerts import (
+    GFM_ALERT_OPEN,
+    AlertRuleFactory,
+)
+
+_REPEAT = 5
+
+
+@dataclass(frozen=True)
+class Result:
+    """One reported timing."""
+
+    case: str
+    label: str
+    seconds: float
+
+    @property
+    def key(self) -> str:
+        """Identifies the same measurement across runs."""
+        return f"{self.case}: {self.label}"
+
+
+_RESULTS: list[Result] = []
+
+
+def _best(
+    func: Callable[[], object],
+    number: int = 1,
+    setup: Callable[[], object] | None = None,
+) -> float:
+    """Best per-call time in seconds over `_REPEAT` runs of `number` calls."""
+    timings = timeit.repeat(
+        func, setup=setup or (lambda: None), number=number, repeat=_REPEAT
+    )
+    return min(timings) / number
+
+
+def _report(case: str, label: str, seconds: float) -> None:
+    _RESULTS.append(Result(case, label, seconds))
+    print(f"{case:<12} {label:<36} {seconds * 1e3:>10.3f} ms")
+
+
+def blockquote_heavy(count: int, *, alert_every: int = 20) -> str:
+    """Mostly plain-prose blockquotes with the occasional alert mixed in."""
+    blocks = []
+    for index in range(count):
+        if index % alert_every == 0:
+            blocks.append(f"> [!NOTE]\n> Alert number {index}.")
+        else:
+            blocks.append(f"> Quoted reply number {index}, which is only prose.")
+    return "\n\n".join(blocks)
+
+
+def small_alerts(count: int) -> str:
+    """Many short alerts, cycling through the canonical, escaped, and legacy syntax."""
+    variants = (
+        "> [!NOTE]\n> Note {index}.",
+        "> [!TIP]\n> Tip {index}.",
+        "> \\[!Important\\] Important {index}.",
+        "> **Warning**\n> Warning {index}.",
+        "> [!CAUTION]\n> Caution {index}.",
+    )
+    return "\n\n".join(
+        variants[index % len(variants)].format(index=index) for index in range(count)
+    )
+
+
+def huge_document(sections: int) -> str:
+    """A single long page of prose, lists, code, and quotes with an alert per section."""
+    return "\n\n".join(
+        f"## Section {index}\n\n"
+        f"Prose for section {index} with *emphasis* and `code`.\n\n"
+        f"> [!NOTE]\n> A note about section {index}.\n>\n> - with a list\n> - of items\n\n"
+        f"```python\nprint({index})\n```\n\n"
+        f"> A plain quote in section {index}."
+        for index in range(sections)
+    )
+
+
+def custom_titles(count: int) -> str:
+    """Alerts with inline custom titles, alternating with and without a body."""
+    return "\n\n".join(
+        f"> [!TIP] Heads up {index}\n> Body {index}."
+        if index % 2
+        else f"> [!WARNING] Breaking change {index}"
+        for index in range(count)
+    )
+
+
+def many_titles(count: int) -> list[str]:
+    """A large `titles` list, as sites with project-specific alert types configure."""
+    return [f"TYPE{index}" for index in range(count)]
+
+
+def bench_prefilter() -> None:
+    """Compare trying every pattern against the first-character dispatch."""
+    factory = AlertRuleFactory()
+    source = blockquote_heavy(5_000)
+    md = MarkdownIt("commonmark")
+    contents = [
+        token.content
+        for token in md.parse(source)
+        if token.type == "inline"  # each blockquote holds a single paragraph
+    ]
+
+    def sequential() -> None:
+        for content in contents:
+            for pattern in factory.patterns:
+                if pattern.match(content):
+                    break
+
+    def prefiltered() -> None:
+        for content in contents:
+            factory._match_marker(content)
+
+    _report("prefilter", "match: every pattern", _best(sequential, number=10))
+    _report(
+        "prefilter", "match: first-character dispatch", _best(prefiltered, number=10)
+    )
+
+    md.use(gfm_alerts_plugin)
+    _report(
+        "prefilter",
+        "render: blockquote-heavy document",
+        _best(lambda: md.render(source)),
+    )
+
+
+def deeply_nested(count: int, depth: int) -> str:
+    """Quoted email threads: `count` single-line replies nested `depth` levels deep."""
+    return "\n\n".join(
+        "> " * depth + f"[!NOTE] Reply {index}" for index in range(count)
+    )
+
+
+def _time_core_rule(
+    source: str,
+    rule: Callable[[StateCore], None] | None = None,
+    **options: object,
+) -> float:
+    """Best time of a core rule alone, each run on a freshly parsed token stream."""
+    md = MarkdownIt("commonmark", options)
+    run = rule or AlertRuleFactory().get_rule()
+    state = StateCore(source, md, {})
+
+    def setup() -> None:
+        state.tokens = md.parse(source)
+
+    return _best(lambda: run(state), setup=setup)
+
+
+def bench_nesting() -> None:
+    """Cost of the core rule as quoted threads get deeper."""
+    for depth in (25, 50, 100, 200):
+        source = deeply_nested(50, depth)
+        seconds = _time_core_rule(source, maxNesting=depth + 10)
+        _report("nesting", f"alert rule at depth {depth}", seconds)
+        seconds = _time_core_rule(
+            source,
+            AlertRuleFactory(parse_nested=False).get_rule(),
+            maxNesting=depth + 10,
+        )
+        _report("nesting", f"outermost only at depth {depth}", seconds)
+
+
+def title_only(count: int) -> str:
+    """Alerts that are only a custom title, so each drops its empty leading paragraph."""
+    return "\n\n".join(f"> [!NOTE] Title {index}" for index in range(count))
+
+
+def bench_title_only() -> None:
+    """Core rule on documents of title-only alerts, whose empty paragraphs are dropped in one pass."""
+    factory = AlertRuleFactory(custom_title=True)
+    for count in (12_500, 25_000, 50_000):
+        source = title_only(count)
+        _report(
+            "title_only",
+            f"alert rule with {count} alerts",
+            _time_core_rule(source, factory.get_rule()),
+        )
+
+
+def bench_index() -> None:
+    """Finding every blockquote's span again versus reading the index the alert rule published."""
+    source = huge_document(2_000)
+    md = MarkdownIt("commonmark").use(gfm_alerts_plugin)
+    env: dict[str, object] = {}
+    tokens = md.parse(source, env)
+    _report(
+        "index",
+        "rescan the tokens",
+        _best(lambda: BlockquoteIndex.from_tokens(tokens), number=10),
+    )
+    _report(
+        "index",
+        "published index",
+        _best(lambda: get_blockquote_index(tokens, env), number=10),
+    )
+
+
+def no_alerts(count: int) -> str:
+    """Typical prose pages: headings, lists, code, bold text, and quotes, but no alert markers."""
+    sections = [
+        f"## Section {index}\n\n"
+        f"Some **bold** prose with a [link](https://example.com/{index}).\n\n"
+        f"- first item\n- second item\n\n"
+        f"> A quoted remark {index}.\n\n"
+        f"```python\nprint({index})\n```"
+        for index in range(count)
+    ]
+    return "\n\n".join(sections)
+
+
+def bench_no_alerts() -> None:
+    """Overhead of the core rule on documents without any alert markers."""
+    source = no_alerts(2_000)
+    factory = AlertRuleFactory()
+
+    def token_walk(state: StateCore) -> None:
+        factory._convert_blockquotes(state.tokens, custom_title=False)
+
+    md = MarkdownIt("commonmark")
+    _report("no_alerts", "parse without the plugin", _best(lambda: md.parse(source)))
+    _report(
+        "no_alerts", "alert rule: full token walk", _time_core_rule(source, token_walk)
+    )
+    _report(
+        "no_alerts",
+        "alert rule: source check",
+        _time_core_rule(source, factory.get_rule()),
+    )
+
+
+def nested_alerts(depth: int, *, body_lines: int = 20) -> str:
+    """Alerts nested `depth` levels deep, each with a multi-line body before its child."""
+    lines: list[str] = []
+    for level in range(depth):
+        prefix = "> " * (level + 1)
+        lines.extend(
+            (f"{prefix}[!NOTE]", *[f"{prefix}Level {level} body."] * body_lines)
+        )
+        lines.append(prefix.rstrip())
+    return "\n".join(lines) + "\n"
+
+
+def bench_render_nested() -> None:
+    """Markdown rendering of alerts nested inside alerts."""
+    for depth in (2, 4, 8, 16):
+        source = nested_alerts(depth)
+        seconds = _best(lambda: mdformat.text(source, extensions={"gfm_alerts"}))  # ruff: ignore[function-uses-loop-variable]
+        _report("nested", f"mdformat.text at depth {depth}", seconds)
+
+
+def bench_meta() -> None:
+    """Memory held by a parsed token stream, with slotted versus dict alert metadata."""
+    md = MarkdownIt("commonmark").use(gfm_alerts_plugin, custom_title=True)
+    source = custom_titles(10_000)
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tokens = md.parse(source)
+        slotted = tracemalloc.get_traced_memory()[0] - baseline
+        alerts = [token for token in tokens if token.type == GFM_ALERT_OPEN]
+        for token in alerts:
+            token.meta = dict(token.meta)
+        as_dict = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    for label, size in (("AlertMeta", slotted), ("dict", as_dict)):
+        print(
+            f"{'meta':<12} {f'{len(alerts)} alerts: {label}':<36} "
+            f"{size / 1024:>10.1f} KiB"
+        )
+    print(
+        f"{'meta':<12} {'saved per alert':<36} {(as_dict - slotted) / len(alerts):>10.1f} B"
+    )
+
+
+_REQUESTS = 400
+_HEARTBEAT_SECONDS = 0.001
+
+
+async def _serve(method: str, documents: list[str]) -> tuple[list[float], float]:
+    """Latency of each request when all arrive at once, and the event loop's longest stall meanwhile."""
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal lag
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(_HEARTBEAT_SECONDS)
+            lag = max(lag, time.perf_counter() - start - _HEARTBEAT_SECONDS)
+
+    async with AsyncFormatter() as formatter:
+
+        async def request(text: str) -> float:
+            start = time.perf_counter()
+            await getattr(formatter, method)(text)
+            return time.perf_counter() - start
+
+        monitor = asyncio.create_task(heartbeat())
+        latencies = await asyncio.gather(*(request(text) for text in documents))
+        done.set()
+        await monitor
+    return latencies, lag
+
+
+def bench_async() -> None:
+    """Latency percentiles of many concurrent requests through `AsyncFormatter`."""
+    # Live previews: mostly short pages, with the occasional huge one
+    documents = [
+        huge_document(200) if index % 50 == 0 else small_alerts(20)
+        for index in range(_REQUESTS)
+    ]
+    for method in ("render", "format"):
+        latencies, lag = asyncio.run(_serve(method, documents))
+        percentiles = statistics.quantiles(latencies, n=100)
+        for percentile in (50, 95, 99):
+            _report(
+                "async",
+                f"{method}: p{percentile} latency",
+                percentiles[percentile - 1],
+            )
+        _report("async", f"{method}: longest event loop stall", lag)
+
+
+def bench_render_many() -> None:
+    """A static site's worth of pages: a new `MarkdownIt` per page against one `AlertRenderer`."""
+    pages = [small_alerts(10) for _ in range(2_000)]
+    options = {"icons": {"note": "<svg/>"}, "class_prefix": "callout"}
+
+    def per_page() -> None:
+        for page in pages:
+            MarkdownIt("commonmark").use(gfm_alerts_plugin, **options).render(page)
+
+    renderer = AlertRenderer(**options)
+    _report("render_many", "new MarkdownIt per page", _best(per_page))
+    _report(
+        "render_many",
+        "AlertRenderer.render_many",
+        _best(lambda: list(renderer.render_many(pages))),
+    )
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        with ProcessPoolExecutor(workers) as executor:
+            seconds = _best(
+                lambda executor=executor: list(
+                    renderer.render_many(pages, executor=executor, chunksize=64)
+                )
+            )
+        _report("render_many", f"render_many, {workers} processes", seconds)
+
+
+@dataclass(frozen=True)
+class Corpus:
+    """A generated document and the plugin options it is rendered with."""
+
+    name: str
+    text: str
+    custom_title: bool = False
+    titles: list[str] | None = None
+
+
+def _suite_corpora() -> list[Corpus]:
+    titles = many_titles(500)
+    return [
+        Corpus("small alerts", small_alerts(2_000)),
+        Corpus("huge document", huge_document(2_000)),
+        Corpus("deep nesting", deeply_nested(100, 40)),
+        Corpus("no alerts", no_alerts(1_000)),
+        Corpus("custom titles", custom_titles(2_000), custom_title=True),
+        Corpus(
+            "many titles",
+            "\n\n".join(f"> [!{title}]\n> Body." for title in titles[::5]),
+            titles=titles,
+        ),
+    ]
+
+
+def bench_suite() -> None:
+    """HTML rendering, mdformat round-trips, and factory setup over every corpus."""
+    for corpus in _suite_corpora():
+        md = MarkdownIt("commonmark").use(
+            gfm_alerts_plugin, titles=corpus.titles, custom_title=corpus.custom_title
+        )
+        seconds = _best(lambda: md.render(corpus.text))  # ruff: ignore[function-uses-loop-variable]
+        _report("suite", f"{corpus.name}: html", seconds)
+        md = MarkdownIt("commonmark").use(
+            gfm_alerts_plugin,
+            titles=corpus.titles,
+            custom_title=corpus.custom_title,
+            engine="block",
+        )
+        seconds = _best(lambda: md.render(corpus.text))  # ruff: ignore[function-uses-loop-variable]
+        _report("suite", f"{corpus.name}: html, block engine", seconds)
+
+        # mdformat always registers the default titles
+        if corpus.titles is None:
+            options = {"custom_title": corpus.custom_title}
+            seconds = _best(
+                lambda text=corpus.text, options=options: mdformat.text(
+                    text, options=options, extensions={"gfm_alerts"}
+                )
+            )
+            _report("suite", f"{corpus.name}: mdformat", seconds)
+
+    # Built directly rather than through the factory cache, and with `re`'s own
+    # compile cache purged before every run, so each run pays the full setup cost
+    for label, titles in (("default", None), ("500 titles", many_titles(500))):
+        seconds = _best(
+            lambda: AlertRuleFactory(titles=titles).patterns,  # ruff: ignore[function-uses-loop-variable]
+            setup=re.purge,
+        )
+        _report("suite", f"factory setup: {label}", seconds)
+
+
+CASES: dict[str, Callable[[], None]] = {
+    "suite": bench_suite,
+    "prefilter": bench_prefilter,
+    "nesting": bench_nesting,
+    "no_alerts": bench_no_alerts,
+    "title_only": bench_title_only,
+    "index": bench_index,
+    "nested": bench_render_nested,
+    "meta": bench_meta,
+    "async": bench_async,
+    "render_many": bench_render_many,
+}
+
+
+def _git_commit() -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return completed.stdout.strip()
+
+
+def _write_results(path: Path) -> None:
+    payload = {
+        "metadata": {
+            "commit": _git_commit(),
+            "plugin": __version__,
+            "mdformat": mdformat.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": [asdict(result) for result in _RESULTS],
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def _compare(path: Path, threshold: float) -> bool:
+    """Print each ratio to the earlier run; False if any exceeds `threshold`."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    baseline = {Result(**entry).key: entry["seconds"] for entry in payload["results"]}
+    commit = payload["metadata"].get("commit") or path.name
+    print(f"\nCompared to {commit} (regression past {threshold:.2f}x):")
+    passed = True
+    for result in _RESULTS:
+        if not (before := baseline.get(result.key)):
+            continue
+        ratio = result.seconds / before
+        regressed = ratio > threshold
+        passed = passed and not regressed
+        status = "SLOWER" if regressed else "ok"
+        print(f"{status:<8} {ratio:>6.2f}x  {result.key}")
+    return passed
+
+
+def main(argv: list[str]) -> None:
+    """Run all or a named subset of benchmark cases."""
+    parser = argparse.ArgumentParser(prog="python scripts/benchmark.py")
+    parser.add_argument("cases", nargs="*", help=f"Subset of: {', '.join(CASES)}")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio that fails --compare (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        print(f"Unknown case(s): {', '.join(unknown)}. Valid: {', '.join(CASES)}")
+        sys.exit(1)
+    for name in args.cases or CASES:
+        CASES[name]()
+
+    if args.output:
+        _write_results(args.output)
+    if args.compare and not _compare(args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
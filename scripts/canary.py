@@ -23,23 +23,45 @@ Example entry, appended to the 'repos' array in 'canary_repos.json'::
         "excludes": ["docs/changelog.md"],
         "options": {"wrap": 120}
     }
+
+File checks run in a process pool, one worker per CPU by default. Pass
+'--jobs N' (e.g. 'tox -e canary -- --jobs 4 some-repo') to change that, or
+'--jobs 1' to run them in-process. Results are reported in file order
+regardless.
+
+Passing verdicts are cached in '.tox/canary/verdicts.json', keyed by each
+file's git blob SHA and its options, so re-runs only check files that
+changed upstream. The whole cache is dropped whenever the plugin source,
+its version, or mdformat's version changes. Pass '--no-cache' to check
+every file.
 """
 
 # ruff:file-ignore[print, subprocess-without-shell-equals-true, start-process-with-partial-path]
 
 from __future__ import annotations
 
+import argparse
 import difflib
+import hashlib
 import json
+import os
 import re
 import subprocess  # ruff:ignore[suspicious-subprocess-import]
 import sys
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from functools import partial
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
+import markdown_it
 import mdformat
+import mdit_py_plugins
+
+import mdformat_gfm_alerts
 
 # Idempotency misses escapes mdformat adds to the original (e.g. autorefs
 # [`pkg`][] -> \[`pkg`\][]); the original-vs-pass-1 diff catches them.
@@ -203,6 +225,9 @@ def _check_file(path: Path, options: dict[str, Any]) -> FileResult:
 
     try:
         pass1 = mdformat.text(original, options=options, extensions=_EXTENSIONS)
+        # Pass 2 would format the same text as pass 1 did
+        if pass1 == original:
+            return FileResult(path=path)
         pass2 = mdformat.text(pass1, options=options, extensions=_EXTENSIONS)
     except Exception as err:
         return FileResult(path=path, error=f"mdformat error: {err}")
@@ -223,31 +248,146 @@ def _check_file(path: Path, options: dict[str, Any]) -> FileResult:
     return FileResult(path=path, diff=diff, new_escapes=new_escapes)
 
 
-def _check_repo(repo: Repo, target_dir: Path) -> CheckResult:
-    files = _collect_files(repo, target_dir)
-    if not files:
+def _check_repo(
+    repo: Repo, target_dir: Path, file_results: Iterable[FileResult]
+) -> CheckResult:
+    results = tuple(file_results)
+    if not results:
         no_match = FileResult(
             path=target_dir,
             error=f"no files matched patterns {repo.patterns}",
         )
         return CheckResult(repo=repo, file_results=(no_match,))
-    return CheckResult(
-        repo=repo,
-        file_results=tuple(_check_file(f, repo.options) for f in files),
+    return CheckResult(repo=repo, file_results=results)
+
+
+_VERDICTS_PATH = _CANARY_DIR.parent / "verdicts.json"
+
+
+def _fingerprint() -> str:
+    """Identify the formatter, so cached verdicts are dropped whenever it changes."""
+    # The parsers' releases change the tokens the plugin and mdformat see, so they key the verdicts too
+    versions = (
+        mdformat_gfm_alerts.__version__,
+        mdformat.__version__,
+        markdown_it.__version__,
+        mdit_py_plugins.__version__,
     )
+    digest = hashlib.sha256("\0".join(versions).encode())
+    # Catch unreleased edits to the plugin too, which don't bump its version
+    package_dir = Path(mdformat_gfm_alerts.__file__).parent
+    for source in sorted(package_dir.rglob("*.py")):
+        digest.update(b"\0" + source.read_bytes())
+    return digest.hexdigest()
 
 
-def _resolve_repos(argv: list[str], all_repos: list[Repo]) -> list[Repo]:
-    if not argv:
+def _load_verdicts(fingerprint: str) -> dict[str, int]:
+    """Cached passing verdicts: `new_escapes` by `_verdict_key`."""
+    try:
+        data = json.loads(_VERDICTS_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if data.get("fingerprint") != fingerprint:
+        return {}
+    return data.get("verdicts", {})
+
+
+def _save_verdicts(fingerprint: str, verdicts: dict[str, int]) -> None:
+    tmp_path = _VERDICTS_PATH.with_suffix(".tmp")
+    tmp_path.write_text(
+        json.dumps({"fingerprint": fingerprint, "verdicts": verdicts}, sort_keys=True),
+        encoding="utf-8",
+    )
+    tmp_path.replace(_VERDICTS_PATH)
+
+
+def _blob_shas(target_dir: Path) -> dict[Path, str]:
+    """Git blob SHA of every checked-out file, read from the index without hashing."""
+    listing = subprocess.run(
+        ["git", "ls-files", "--stage", "-z"],
+        cwd=target_dir,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    shas: dict[Path, str] = {}
+    for entry in listing.split("\0"):
+        if entry:
+            # "<mode> <sha> <stage>\t<path>"
+            info, _, name = entry.partition("\t")
+            shas[target_dir / name] = info.split()[1]
+    return shas
+
+
+def _verdict_key(blob_sha: str, options: dict[str, Any]) -> str:
+    return f"{blob_sha}:{json.dumps(options, sort_keys=True)}"
+
+
+# Each file costs two mdformat passes, so batch a few per round trip to a worker
+_CHUNKSIZE = 4
+
+
+def _check_repos(
+    repos: list[Repo], jobs: int, verdicts: dict[str, int]
+) -> list[CheckResult]:
+    """Check every file of every repo not in `verdicts`, over `jobs` worker processes.
+
+    Files that pass are added to `verdicts`.
+    """
+    # (path, verdict key, cached new_escapes) per file, all decided before any
+    # check runs, so a verdict recorded mid-run can't desync the results below.
+    plans: list[list[tuple[Path, str | None, int | None]]] = []
+    for repo in repos:
+        files = _collect_files(repo, _CANARY_DIR / repo.name)
+        blob_shas = _blob_shas(_CANARY_DIR / repo.name) if files else {}
+        plan = []
+        for path in files:
+            key = (
+                _verdict_key(blob_shas[path], repo.options)
+                if path in blob_shas
+                else None
+            )
+            plan.append((path, key, verdicts.get(key) if key else None))
+        plans.append(plan)
+
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as pool:
+        mapper = partial(pool.map, chunksize=_CHUNKSIZE) if pool else map
+        # `map` submits every file up front, so workers stay busy across repo
+        # boundaries, and yields results in submission order.
+        pending: list[Iterator[FileResult]] = [
+            mapper(
+                _check_file,
+                [path for path, _key, cached in plan if cached is None],
+                repeat(repo.options),
+            )
+            for repo, plan in zip(repos, plans, strict=True)
+        ]
+        results = []
+        for repo, plan, checked in zip(repos, plans, pending, strict=True):
+            file_results = []
+            for path, key, cached in plan:
+                if cached is not None:
+                    file_results.append(FileResult(path=path, new_escapes=cached))
+                    continue
+                result = next(checked)
+                if result.passed and key is not None:
+                    verdicts[key] = result.new_escapes
+                file_results.append(result)
+            results.append(_check_repo(repo, _CANARY_DIR / repo.name, file_results))
+    return results
+
+
+def _resolve_repos(names: list[str], all_repos: list[Repo]) -> list[Repo]:
+    if not names:
         return list(all_repos)
     valid = {r.name for r in all_repos}
-    unknown = [name for name in argv if name not in valid]
+    unknown = [name for name in names if name not in valid]
     if unknown:
         print(
             f"Unknown repo(s): {', '.join(unknown)}. Valid: {', '.join(sorted(valid))}"
         )
         sys.exit(1)
-    return [r for r in all_repos if r.name in argv]
+    return [r for r in all_repos if r.name in names]
 
 
 def _print_results(results: list[CheckResult]) -> None:
@@ -277,6 +417,24 @@ def _print_results(results: list[CheckResult]) -> None:
 
 def main(argv: list[str]) -> None:
     """Run canary checks against all or a named subset of repos."""
+    parser = argparse.ArgumentParser(prog="python scripts/canary.py")
+    parser.add_argument("repos", nargs="*", help="Subset of repo names to check")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for file checks (default: CPU count, %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Check every file, ignoring and not updating cached verdicts",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     all_repos = _load_repos(_REPOS_PATH)
 
     if not all_repos:
@@ -286,12 +444,16 @@ def main(argv: list[str]) -> None:
         )
         return
 
-    repos = _resolve_repos(argv, all_repos)
+    repos = _resolve_repos(args.repos, all_repos)
 
     _CANARY_DIR.mkdir(parents=True, exist_ok=True)
     with ThreadPoolExecutor(max_workers=len(repos)) as pool:
         list(pool.map(lambda r: _clone_or_pull(r, _CANARY_DIR / r.name), repos))
-    results = [_check_repo(repo, _CANARY_DIR / repo.name) for repo in repos]
+    fingerprint = _fingerprint()
+    verdicts = {} if args.no_cache else _load_verdicts(fingerprint)
+    results = _check_repos(repos, args.jobs, verdicts)
+    if not args.no_cache:
+        _save_verdicts(fingerprint, verdicts)
 
     _print_results(results)
 
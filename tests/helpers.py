@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import re
+from pathlib import Path
+
+from markdown_it.utils import read_fixture_file
 
 _SHOW_TEXT = True
+_TESTS_DIR = Path(__file__).parent
 
 
 def separate_indent(line: str) -> tuple[str, str]:
@@ -35,3 +39,17 @@ def print_text(output: str, expected: str, show_whitespace: bool = False) -> Non
         print("-- Expected --")  # ruff:ignore[print]
         _print(expected, show_whitespace)
         print("--  <End>   --")  # ruff:ignore[print]
+
+
+def fixture_texts(suite: str) -> list[str]:
+    """Input text of every fixture in `tests/<suite>/fixtures`, in file order.
+
+    Args:
+        suite: "format" or "render"
+
+    """
+    return [
+        text
+        for path in sorted((_TESTS_DIR / suite / "fixtures").glob("*.md"))
+        for _line, _title, text, _expected in read_fixture_file(path)
+    ]
@@ -0,0 +1,42 @@
+import dataclasses
+import json
+
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts.mdit_plugins import AlertMeta, gfm_alerts_plugin
+
+
+def test_alert_meta_reads_like_the_dict_it_replaces():
+    md = MarkdownIt().use(gfm_alerts_plugin, custom_title=True)
+    first, second = (
+        token.meta
+        for token in md.parse("> [!TIP] Heads up\n\n> [!tip]\n")
+        if token.type == "gfm_alert_open"
+    )
+    assert isinstance(first, AlertMeta)
+    assert first == {"title": "TIP", "icon": "", "inline_title": "Heads up"}
+    assert dict(second) == {"title": "tip", "icon": "", "inline_title": ""}
+    assert first.get("missing") is None
+    with pytest.raises(KeyError):
+        first["missing"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.title = "NOTE"  # type: ignore[misc]
+    assert not hasattr(first, "__dict__")
+
+
+def test_alert_tokens_serialize_to_json():
+    md = MarkdownIt().use(gfm_alerts_plugin, custom_title=True)
+    token = next(
+        token
+        for token in md.parse("> [!TIP] Heads up\n")
+        if token.type == "gfm_alert_open"
+    )
+    with pytest.raises(TypeError):
+        json.dumps(token.as_dict())
+    expected = {"title": "TIP", "icon": "", "inline_title": "Heads up"}
+    serialized = json.loads(json.dumps(token.as_dict(meta_serializer=dict)))
+    assert serialized["meta"] == expected
+    meta: object = token.meta
+    assert isinstance(meta, AlertMeta)
+    assert json.loads(json.dumps(meta.as_dict())) == expected
@@ -0,0 +1,112 @@
+from typing import Any
+
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts.mdit_plugins import (
+    BLOCKQUOTE_INDEX_ENV_KEY,
+    BlockquoteIndex,
+    get_blockquote_index,
+    gfm_alerts_plugin,
+)
+
+# Title-only alerts drop their empty paragraphs, including one an enclosing blockquote first pointed at
+_SOURCE = """\
+Intro.
+
+> [!NOTE] Title only
+
+> Quote
+>
+> > [!TIP]
+> > Tip body.
+
+> > [!NOTE] C
+> >
+> > > [!TIP] F
+> > >
+> > > [!WARNING]
+
+> #
+"""
+
+
+def _rows(index):
+    return list(
+        zip(index.opens, index.closes, index.first_inlines, index.alerts, strict=True)
+    )
+
+
+def _parse(**options):
+    env: dict[str, Any] = {}
+    md = MarkdownIt().use(gfm_alerts_plugin, custom_title=True, **options)
+    return md.parse(_SOURCE, env), env
+
+
+def test_alert_rule_publishes_the_index_of_its_output():
+    tokens, env = _parse()
+    index = env[BLOCKQUOTE_INDEX_ENV_KEY]
+    assert _rows(index) == _rows(BlockquoteIndex.from_tokens(tokens))
+    assert index.token_count == len(tokens)
+    assert get_blockquote_index(tokens, env) is index
+    for open_index, close_index, first_inline, alert in _rows(index):
+        opening, closing = tokens[open_index], tokens[close_index]
+        assert opening.level == closing.level
+        assert opening.type.endswith("_open")
+        assert closing.type.endswith("_close")
+        assert alert == (opening.type == "gfm_alert_open")
+        if first_inline != -1:
+            assert open_index < first_inline < close_index
+            assert tokens[first_inline].type == "inline"
+
+
+def test_rows_are_in_document_order():
+    tokens, env = _parse()
+    index = get_blockquote_index(tokens, env)
+    assert list(index.opens) == sorted(index.opens)
+    assert [tokens[first].content for first in index.first_inlines if first != -1] == [
+        "Quote",
+        "Tip body.",
+        "",
+    ]
+    row = len(index) - 1
+    assert index.row(index.opens[row]) == row
+    with pytest.raises(KeyError):
+        index.row(index.opens[row] + 1)
+
+
+def test_block_engine_is_indexed_on_request():
+    tokens, env = _parse(engine="block")
+    assert BLOCKQUOTE_INDEX_ENV_KEY not in env
+    index = get_blockquote_index(tokens, env)
+    assert env[BLOCKQUOTE_INDEX_ENV_KEY] is index
+    _, core_env = _parse()
+    assert _rows(index) == _rows(core_env[BLOCKQUOTE_INDEX_ENV_KEY])
+
+
+def test_outermost_only_parsing_still_indexes_inner_blockquotes():
+    tokens, env = _parse(parse_nested=False)
+    assert BLOCKQUOTE_INDEX_ENV_KEY not in env
+    index = get_blockquote_index(tokens, env)
+    opening_types = [tokens[open_index].type for open_index in index.opens]
+    assert opening_types.count("blockquote_open") == sum(
+        token.type == "blockquote_open" for token in tokens
+    )
+    assert "gfm_alert_open" in opening_types
+
+
+def test_index_of_an_earlier_document_is_not_reused():
+    md = MarkdownIt().use(gfm_alerts_plugin)
+    env: dict[str, Any] = {}
+    md.parse("> [!NOTE]\n> Body.\n", env)
+    md.parse("> A plain quote.\n", env)
+    assert BLOCKQUOTE_INDEX_ENV_KEY not in env
+
+
+def test_index_is_rebuilt_after_tokens_change():
+    tokens, env = _parse()
+    published = env[BLOCKQUOTE_INDEX_ENV_KEY]
+    del tokens[:3]
+    index = get_blockquote_index(tokens, env)
+    assert index is not published
+    assert index.opens[0] == published.opens[0] - 3
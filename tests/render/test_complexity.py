@@ -0,0 +1,209 @@
+r"""Scaling guard: formatting and rendering must grow (near-)linearly with the input.
+
+`test_security.py` checks one amplified input against a fixed budget, which
+misses cost that is merely quadratic at realistic sizes (re-slicing a token
+list per alert, rendering a title twice per nesting level). Each `Axis` below
+grows one dimension of a document while the rest stays fixed, times it at
+four sizes, and fits the slope of log(time) against log(input bytes). A
+slope of 1 is linear, and 2 is quadratic; each axis fails above its
+`max_slope`.
+
+Keep the smallest size of each axis at 20 ms or more: below that, timer
+noise and other load on the machine decide the fitted slope. That makes the
+whole harness take tens of seconds, so it only runs when
+`MDFORMAT_GFM_ALERTS_SCALING_TESTS=1` is set, as the `scaling` tox env and
+CI job do:
+
+    tox -e scaling
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import timeit
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Literal
+
+import mdformat
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts.mdit_plugins import clear_factory_cache, gfm_alerts_plugin
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("MDFORMAT_GFM_ALERTS_SCALING_TESTS") != "1",
+    reason="timing-sensitive; set MDFORMAT_GFM_ALERTS_SCALING_TESTS=1 to run",
+)
+
+# Noise and fixed per-call costs keep measured linear axes within about 0.1 of 1, while quadratic growth fits 2
+_LINEAR = 1.3
+# For axes where an n log n term (sorting, a balanced search) would be acceptable
+_N_LOG_N = 1.45
+_REPEAT = 5
+# mdformat parses with markdown-it's default nesting limit, so deeper input stops nesting
+_MDFORMAT_MAX_DEPTH = 16
+_COPIES = 128
+
+
+def _alerts(count: int) -> str:
+    return "\n\n".join(f"> [!NOTE]\n> Body {index}." for index in range(count))
+
+
+def _long_body(paragraphs: int) -> str:
+    # Separate paragraphs: mdformat itself is super-linear on a single very long paragraph
+    return "> [!TIP]\n" + "\n>\n".join(
+        f"> Paragraph {index} of the body." for index in range(paragraphs)
+    )
+
+
+def _inline_title(words: int) -> str:
+    return "> [!TIP] " + " ".join(f"*w{index}*" for index in range(words)) + "\n> Body."
+
+
+def _nested(depth: int) -> str:
+    lines: list[str] = []
+    for level in range(1, depth + 1):
+        prefix = "> " * level
+        lines += [f"{prefix}[!NOTE]", f"{prefix}Level {level}.", prefix.rstrip()]
+    return "\n".join(lines)
+
+
+def _titles(count: int) -> list[str]:
+    return [f"TYPE{index}" for index in range(count)]
+
+
+@dataclass(frozen=True)
+class Axis:
+    """One input dimension, grown while everything else about the document stays fixed."""
+
+    id: str
+    path: Literal["format", "render"]
+    document: Callable[[int], str]
+    sizes: tuple[int, ...]
+    options: Callable[[int], Mapping[str, Any]] = lambda _size: {}
+    max_slope: float = _LINEAR
+    # Whether each timed run pays for configuring the plugin
+    setup_cost: bool = False
+
+    def run(self, size: int) -> tuple[Callable[[], object], int]:
+        """What to time at `size`, and the input's length in bytes."""
+        text = self.document(size)
+        options = self.options(size)
+
+        def configure() -> MarkdownIt:
+            md = MarkdownIt("commonmark", {"maxNesting": 1_000})
+            return md.use(gfm_alerts_plugin, **options)
+
+        def configure_and_render() -> str:
+            return configure().render(text)
+
+        run: Callable[[], object]
+        if self.path == "format":
+            run = partial(
+                mdformat.text, text, options=options, extensions={"gfm_alerts"}
+            )
+        elif self.setup_cost:
+            run = configure_and_render
+        else:
+            run = partial(configure().render, text)
+        return run, len(text.encode())
+
+
+_AXES = [
+    Axis("alerts-format", "format", _alerts, (375, 750, 1_500, 3_000)),
+    Axis("alerts-render", "render", _alerts, (1_000, 2_000, 4_000, 8_000)),
+    Axis("body-format", "format", _long_body, (500, 1_000, 2_000, 4_000)),
+    Axis("body-render", "render", _long_body, (2_000, 4_000, 8_000, 16_000)),
+    # Each title-only alert drops an empty paragraph from the token list
+    Axis(
+        "title-only-render",
+        "render",
+        lambda count: "\n\n".join(f"> [!NOTE] Title {index}" for index in range(count)),
+        (1_000, 2_000, 4_000, 8_000),
+        options=lambda _size: {"custom_title": True},
+    ),
+    Axis(
+        "inline-title-format",
+        "format",
+        _inline_title,
+        (50_000, 100_000, 200_000, 400_000),
+        options=lambda _size: {"custom_title": True},
+    ),
+    Axis(
+        "inline-title-render",
+        "render",
+        _inline_title,
+        (50_000, 100_000, 200_000, 400_000),
+        options=lambda _size: {"custom_title": True},
+    ),
+    Axis(
+        "depth-format",
+        "format",
+        lambda depth: "\n\n".join([_nested(depth)] * _COPIES),
+        (2, 4, 8, _MDFORMAT_MAX_DEPTH),
+    ),
+    # Input bytes grow with the square of the depth, so these depths double them
+    Axis(
+        "depth-render",
+        "render",
+        lambda depth: "\n\n".join([_nested(depth)] * 2),
+        (100, 141, 200, 283),
+    ),
+    # One alert per configured title, so the document and the title list grow together
+    Axis(
+        "titles-render",
+        "render",
+        lambda count: "\n\n".join(f"> [!{title}]\n> Body." for title in _titles(count)),
+        (600, 1_200, 2_400, 4_800),
+        options=lambda count: {"titles": _titles(count)},
+        max_slope=_N_LOG_N,
+        setup_cost=True,
+    ),
+]
+
+
+def _reset_caches() -> None:
+    clear_factory_cache()
+    re.purge()
+
+
+def _timings(axis: Axis) -> list[tuple[int, float]]:
+    points = []
+    for size in axis.sizes:
+        run, size_bytes = axis.run(size)
+        setup = _reset_caches if axis.setup_cost else (lambda: None)
+        seconds = min(timeit.repeat(run, setup=setup, number=1, repeat=_REPEAT))
+        points.append((size_bytes, seconds))
+    return points
+
+
+def _slope(points: list[tuple[int, float]]) -> float:
+    """Least-squares slope of log(seconds) against log(bytes)."""
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys, strict=True))
+    return covariance / sum((x - mean_x) ** 2 for x in xs)
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize("axis", _AXES, ids=lambda axis: axis.id)
+def test_growth_is_at_most_linear(axis: Axis) -> None:
+    points = _timings(axis)
+    if _slope(points) > axis.max_slope:
+        # A single stall on a busy machine can skew four points; keep the best of a second pass
+        retry = _timings(axis)
+        points = [
+            (size, min(first, second))
+            for (size, first), (_, second) in zip(points, retry, strict=True)
+        ]
+    slope = _slope(points)
+    assert slope <= axis.max_slope, (
+        f"{axis.id} grew as bytes**{slope:.2f} (limit {axis.max_slope}): "
+        + ", ".join(f"{size} B in {seconds * 1e3:.1f} ms" for size, seconds in points)
+    )
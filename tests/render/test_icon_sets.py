@@ -0,0 +1,67 @@
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts import AlertRenderer
+from mdformat_gfm_alerts.mdit_plugins import (
+    ICON_SETS,
+    clear_factory_cache,
+    gfm_alerts_plugin,
+    load_icon_set,
+)
+from mdformat_gfm_alerts.mdit_plugins._gfm_alerts import (
+    _FACTORY_CACHE,
+    DEFAULT_TITLES,
+)
+
+
+@pytest.fixture
+def fresh_caches():
+    clear_factory_cache()
+    load_icon_set.cache_clear()
+    yield
+    clear_factory_cache()
+
+
+pytestmark = pytest.mark.usefixtures("fresh_caches")
+
+
+@pytest.mark.parametrize("name", ICON_SETS)
+def test_icon_set_covers_the_default_titles(name):
+    icons = load_icon_set(name)
+    assert sorted(icons) == sorted(title.lower() for title in DEFAULT_TITLES)
+    assert all(icon.startswith("<svg ") for icon in icons.values())
+    with pytest.raises(TypeError):
+        icons["note"] = ""  # type: ignore[index]
+
+
+def test_octicons_render_before_the_title():
+    md = MarkdownIt().use(gfm_alerts_plugin, icons="octicons")
+    html = md.render("> [!WARNING]\n> Body.\n")
+    expected = f'<p class="markdown-alert-title">{load_icon_set("octicons")["warning"]}Warning</p>'
+    assert expected in html
+
+
+def test_icon_set_is_loaded_on_first_use_only():
+    MarkdownIt().use(gfm_alerts_plugin).render("> [!NOTE]\n> Body.\n")
+    assert load_icon_set.cache_info().currsize == 0
+
+
+def test_icon_set_is_shared_by_reference_across_factories():
+    class_prefixes = ("markdown-alert", "callout")
+    for class_prefix in class_prefixes:
+        MarkdownIt().use(gfm_alerts_plugin, icons="octicons", class_prefix=class_prefix)
+    factories = list(_FACTORY_CACHE._factories.values())  # ruff: ignore[private-member-access]
+    assert len(factories) == len(class_prefixes)
+    assert all(factory.icons is load_icon_set("octicons") for factory in factories)
+    assert load_icon_set.cache_info().misses == 1
+
+
+def test_alert_renderer_accepts_an_icon_set():
+    renderer = AlertRenderer(icons="octicons")
+    assert "octicon-light-bulb" in renderer.render("> [!TIP]\n> Body.\n")
+    assert "<svg" not in renderer.config.plugin_options_json
+
+
+def test_unknown_icon_set_is_rejected():
+    with pytest.raises(ValueError, match="icons"):
+        MarkdownIt().use(gfm_alerts_plugin, icons="emoji")
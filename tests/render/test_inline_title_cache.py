@@ -0,0 +1,68 @@
+import gc
+import weakref
+
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts.mdit_plugins import gfm_alerts_plugin, inline_title_cache_info
+
+_TEXT = "> [!TIP] Heads *up*\n> Body.\n\n> [!WARNING] Breaking change\n\n> [!TIP] Heads *up*\n"
+
+
+def test_repeated_titles_render_once():
+    md = MarkdownIt().use(gfm_alerts_plugin, custom_title=True)
+    uncached = MarkdownIt().use(
+        gfm_alerts_plugin, custom_title=True, inline_title_cache_size=0
+    )
+    assert md.render(_TEXT) == uncached.render(_TEXT)
+    assert "Heads <em>up</em>" in md.render(_TEXT)
+
+    info = inline_title_cache_info(md)
+    assert info is not None
+    assert (info.hits, info.misses, info.currsize) == (4, 2, 2)
+
+
+def test_cache_is_scoped_to_the_instance():
+    typographer = (
+        MarkdownIt("commonmark", {"typographer": True})
+        .enable("replacements")
+        .use(gfm_alerts_plugin, custom_title=True)
+    )
+    plain = MarkdownIt().use(gfm_alerts_plugin, custom_title=True)
+    text = "> [!NOTE] (c) Title\n"
+    assert "\N{COPYRIGHT SIGN}" in typographer.render(text)
+    assert "(c)" in plain.render(text)
+    assert inline_title_cache_info(MarkdownIt()) is None
+
+
+@pytest.mark.parametrize(
+    ("text", "before", "options", "after"),
+    [
+        ("> [!NOTE] <b>Title</b>\n", "<b>Title</b>", {"html": False}, "&lt;b&gt;"),
+        ("> [!NOTE] (c) Title\n", "(c)", {"typographer": True}, "\N{COPYRIGHT SIGN}"),
+    ],
+    ids=["html", "typographer"],
+)
+def test_cache_follows_option_changes(text, before, options, after):
+    md = (
+        MarkdownIt("commonmark")
+        .enable("replacements")
+        .use(gfm_alerts_plugin, custom_title=True)
+    )
+    assert before in md.render(text)
+    md.set({**md.options, **options})
+    assert after in md.render(text)
+
+
+def test_cache_does_not_keep_the_instance_alive():
+    md = MarkdownIt().use(gfm_alerts_plugin, custom_title=True)
+    md.render(_TEXT)
+    instance = weakref.ref(md)
+    del md
+    gc.collect()
+    assert instance() is None
+
+
+def test_negative_cache_size_is_rejected():
+    with pytest.raises(ValueError, match="inline_title_cache_size"):
+        MarkdownIt().use(gfm_alerts_plugin, inline_title_cache_size=-1)
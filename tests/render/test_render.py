@@ -5,7 +5,11 @@ import pytest
 from markdown_it import MarkdownIt
 from markdown_it.utils import read_fixture_file
 
-from mdformat_gfm_alerts.mdit_plugins import gfm_alerts_plugin
+from mdformat_gfm_alerts.mdit_plugins import (
+    ENGINES,
+    GFM_ALERTS_PREFIX,
+    gfm_alerts_plugin,
+)
 from tests.helpers import print_text
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures"
@@ -23,15 +27,54 @@ def with_plugin(filename, plugins):
             "gfm_alerts_custom_title.md",
             [partial(gfm_alerts_plugin, custom_title=True)],
         ),
+        *with_plugin(
+            "gfm_alerts_not_nested.md",
+            [partial(gfm_alerts_plugin, parse_nested=False)],
+        ),
     ],
 )
-def test_render(line, title, text, expected, plugins):
+@pytest.mark.parametrize("engine", ENGINES)
+def test_render(line, title, text, expected, plugins, engine):  # ruff: ignore[too-many-positional-arguments]
     md = MarkdownIt("commonmark")
     for plugin in plugins:
-        md.use(plugin)
+        md.use(plugin, engine=engine)
     if "DISABLE-CODEBLOCKS" in title:
         md.disable("code")
     md.options["xhtmlOut"] = False
     output = md.render(text)
     print_text(output, expected, show_whitespace=False)
     assert output.rstrip() == expected.rstrip()
+
+
+def test_block_engine_skips_the_core_pass():
+    md = MarkdownIt("commonmark").use(gfm_alerts_plugin, engine="block")
+    assert GFM_ALERTS_PREFIX not in md.core.ruler.get_all_rules()
+    assert md.render("> [!TIP]\n> Body.\n").startswith(
+        '<div class="markdown-alert markdown-alert-tip">'
+    )
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError, match="engine"):
+        MarkdownIt().use(gfm_alerts_plugin, engine="inline")
+
+
+def test_block_engine_matches_core_on_deep_nesting():
+    # Title-only alerts drop their paragraphs, and empty or list-wrapped quotes precede the next inline
+    text = "\n\n".join(
+        (
+            "> [!NOTE] Outer\n> > [!TIP] Inner\n> > > [!WARNING] Innermost\n> > > Body.",
+            "> > >\n> > [!note]\n> > Body.",
+            "> - > [!TIP] Title\n>   > > [!NOTE]\n>   > > Body.",
+            "> " * 15 + "[!CAUTION] Deep",
+        )
+    )
+    rendered = [
+        MarkdownIt("commonmark")
+        .use(gfm_alerts_plugin, custom_title=True, engine=engine)
+        .render(text)
+        for engine in ENGINES
+    ]
+    expected_alerts = 7
+    assert rendered[0] == rendered[1]
+    assert rendered[0].count("markdown-alert-title") == expected_alerts
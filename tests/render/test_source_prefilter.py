@@ -0,0 +1,42 @@
+# ruff:file-ignore[private-member-access]
+
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts.mdit_plugins import gfm_alerts_plugin
+from mdformat_gfm_alerts.mdit_plugins._gfm_alerts import AlertRuleFactory
+
+_ALERT_CLASS = "markdown-alert"
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "text"),
+    [
+        ({}, "> [!NOTE]\n> Body.\n"),
+        ({}, "> \\[!Note\\] Body.\n"),
+        ({}, "> **Note**\n> Body.\n"),
+        ({}, "> **WARNING**: Body.\n"),
+        ({}, "> **Warnİng**\n> Body.\n"),  # IGNORECASE matches the Turkish capital I
+        ({"custom_title": True}, "> [!TIP] Heads up\n> Body.\n"),
+        ({"titles": ["*"]}, "> [!FAQ]\n> Body.\n"),
+        ({"match_case_sensitive": True}, "> **Warning**\n> Body.\n"),
+    ],
+)
+def test_source_prefilter_keeps_every_marker(kwargs, text):
+    assert AlertRuleFactory(**kwargs)._may_contain_alert(text)
+    md = MarkdownIt().use(gfm_alerts_plugin, **kwargs)
+    assert _ALERT_CLASS in md.render(text)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "text"),
+    [
+        ({}, "> Quoted prose with **bold** text.\n"),
+        ({}, "- [link](https://example.com)\n"),
+        ({"match_case_sensitive": True}, "> **note**\n> Body.\n"),
+    ],
+)
+def test_source_prefilter_skips_documents_without_markers(kwargs, text):
+    assert not AlertRuleFactory(**kwargs)._may_contain_alert(text)
+    md = MarkdownIt().use(gfm_alerts_plugin, **kwargs)
+    assert _ALERT_CLASS not in md.render(text)
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import mdformat
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts import AsyncFormatter
+from mdformat_gfm_alerts.mdit_plugins import gfm_alerts_plugin
+from tests.helpers import fixture_texts
+
+_TEXTS = fixture_texts("format")
+
+
+def test_format_and_render_match_the_sync_apis():
+    options = {"custom_title": True}
+
+    async def run():
+        async with AsyncFormatter(options, max_workers=2) as formatter:
+            return await asyncio.gather(
+                *(formatter.format(text) for text in _TEXTS),
+                *(formatter.render(text) for text in _TEXTS),
+            )
+
+    md = MarkdownIt("commonmark").use(gfm_alerts_plugin)
+    assert asyncio.run(run()) == [
+        *(
+            mdformat.text(text, options=options, extensions={"gfm_alerts"})
+            for text in _TEXTS
+        ),
+        *(md.render(text) for text in _TEXTS),
+    ]
+
+
+def test_parsers_are_pooled_per_worker():
+    builds: list[MarkdownIt] = []
+
+    def markdown_it():
+        builds.append(MarkdownIt("commonmark").use(gfm_alerts_plugin))
+        return builds[-1]
+
+    async def run():
+        async with AsyncFormatter(markdown_it=markdown_it, max_workers=2) as formatter:
+            await asyncio.gather(*(formatter.render("> [!NOTE]\n") for _ in range(50)))
+
+    asyncio.run(run())
+    assert 1 <= len(builds) <= 2  # ruff: ignore[magic-value-comparison]
+
+
+def test_pending_documents_are_bounded_and_cancellable():
+    release = threading.Event()
+    started = []
+
+    class Parser(MarkdownIt):
+        def render(self, src, env=None):  # ruff: ignore[no-self-use, unused-method-argument]
+            started.append(src)
+            release.wait()
+            return src
+
+    async def run():
+        formatter = AsyncFormatter(markdown_it=Parser, max_workers=1, max_pending=2)
+        tasks = [
+            asyncio.create_task(formatter.render(str(index))) for index in range(4)
+        ]
+        await asyncio.sleep(0.1)
+        # One document is being parsed and one is queued; the rest wait for a slot
+        assert started == ["0"]
+        assert formatter._slots.locked()  # ruff: ignore[private-member-access]
+        tasks[1].cancel()
+        tasks[3].cancel()
+        # Cancellation reaches the executor on the next pass of the loop
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        formatter.close()
+        return results
+
+    results = asyncio.run(run())
+    assert results[0] == "0"
+    assert results[2] == "2"
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert isinstance(results[3], asyncio.CancelledError)
+    # The cancelled documents never reached a parser
+    assert started == ["0", "2"]
+
+
+@pytest.mark.parametrize("kwargs", [{"max_workers": 0}, {"max_pending": 0}])
+def test_invalid_bounds_are_rejected(kwargs):
+    with pytest.raises(ValueError, match="at least 1"):
+        AsyncFormatter(**kwargs)
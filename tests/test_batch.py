@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import mdformat
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts import AlertRenderer, format_many
+from mdformat_gfm_alerts.mdit_plugins import gfm_alerts_plugin
+from tests.helpers import fixture_texts
+
+_TEXTS = fixture_texts("format")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"custom_title": True}, {"wrap": 20}, {"number": True}],
+    ids=["default", "custom_title", "wrap", "number"],
+)
+def test_format_many_matches_mdformat_text(options):
+    expected = [
+        mdformat.text(text, options=options, extensions={"gfm_alerts"})
+        for text in _TEXTS
+    ]
+    assert list(format_many(_TEXTS, options)) == expected
+
+
+@pytest.mark.parametrize("executor_cls", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_format_many_with_executor_preserves_order(executor_cls):
+    options = {"custom_title": True}
+    expected = list(format_many(_TEXTS, options))
+    with executor_cls(max_workers=2) as executor:
+        result = list(format_many(_TEXTS, options, executor=executor, chunksize=4))
+    assert result == expected
+
+
+def test_format_many_is_lazy():
+    def texts():
+        yield "> [!NOTE]\n> Body.\n"
+        raise AssertionError("consumed past the first document")
+
+    assert next(format_many(texts())) == "> [!NOTE]\n> Body.\n"
+
+
+_SOURCES = fixture_texts("render")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"custom_title": True},
+        {"titles": ["FAQ", "NOTE"], "icons": {"note": "<svg/>"}},
+        {"class_prefix": "callout", "parse_nested": False},
+    ],
+    ids=["default", "custom_title", "titles-icons", "class_prefix-not-nested"],
+)
+def test_render_many_matches_a_new_markdown_it_per_page(options):
+    expected = [
+        MarkdownIt("commonmark").use(gfm_alerts_plugin, **options).render(text)
+        for text in _SOURCES
+    ]
+    assert list(AlertRenderer(**options).render_many(_SOURCES)) == expected
+
+
+@pytest.mark.parametrize("executor_cls", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_render_many_with_executor_preserves_order(executor_cls):
+    renderer = AlertRenderer(icons={"tip": "<svg/>"}, custom_title=True)
+    expected = list(renderer.render_many(_SOURCES))
+    with executor_cls(max_workers=2) as executor:
+        result = list(renderer.render_many(_SOURCES, executor=executor, chunksize=4))
+    assert result == expected
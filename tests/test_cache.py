@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import markdown_it
+import mdformat
+import pytest
+
+from mdformat_gfm_alerts import format_many
+from mdformat_gfm_alerts.batch import BatchFormatter, FormatterConfig
+from mdformat_gfm_alerts.cache import ResultCache, main
+
+_TEXTS = ["> [!TIP] Heads up\n> Body.\n", "> **Note**\n> Body.\n", "Plain *prose*.\n"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def format_calls(monkeypatch):
+    calls: list[str] = []
+    original = BatchFormatter.format
+
+    def counting_format(self, text):
+        calls.append(text)
+        return original(self, text)
+
+    monkeypatch.setattr(BatchFormatter, "format", counting_format)
+    return calls
+
+
+def test_cached_output_matches_and_skips_parsing(cache, format_calls):
+    expected = [mdformat.text(text, extensions={"gfm_alerts"}) for text in _TEXTS]
+    assert list(format_many(_TEXTS, cache=cache)) == expected
+    assert len(format_calls) == len(_TEXTS)
+
+    assert list(format_many(_TEXTS, cache=cache)) == expected
+    assert len(format_calls) == len(_TEXTS)
+
+
+def test_cache_with_executor_only_formats_misses(cache):
+    options = {"custom_title": True}
+    list(format_many(_TEXTS[:1], options, cache=cache))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = list(format_many(_TEXTS, options, executor=executor, cache=cache))
+    assert result == list(format_many(_TEXTS, options))
+
+
+def test_key_depends_on_resolved_options():
+    text = _TEXTS[0]
+    default = ResultCache.key(text, FormatterConfig.from_args({}))
+    custom_title = ResultCache.key(
+        text, FormatterConfig.from_args({"custom_title": True})
+    )
+    assert default != custom_title
+    assert default == ResultCache.key(text, FormatterConfig.from_args(None))
+
+
+def test_changed_parser_version_misses(cache, format_calls, monkeypatch):
+    list(format_many(_TEXTS[:1], cache=cache))
+    monkeypatch.setattr(markdown_it, "__version__", f"{markdown_it.__version__}.post1")
+    list(format_many(_TEXTS[:1], cache=cache))
+    assert len(format_calls) == 2  # ruff: ignore[magic-value-comparison]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=250)
+    keys = [f"{index:064x}" for index in range(4)]
+    for index, key in enumerate(keys):
+        cache.put(key, "x" * 100)
+        # Make each write strictly newer so eviction order doesn't depend on timer resolution
+        os.utime(cache._path(key), (index, index))  # ruff: ignore[private-member-access]
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[-1]) == "x" * 100
+
+
+def test_entry_evicted_during_a_hit_stays_a_miss(cache, monkeypatch):
+    key = f"{0:064x}"
+    cache.put(key, "FORMATTED")
+    original = Path.read_text
+
+    def read_then_evict(self, *args, **kwargs):
+        text = original(self, *args, **kwargs)
+        self.unlink()  # Another process evicts the entry between the read and the mtime refresh
+        return text
+
+    monkeypatch.setattr(Path, "read_text", read_then_evict)
+    assert cache.get(key) is None
+    monkeypatch.undo()
+    assert not cache._path(key).exists()  # ruff: ignore[private-member-access]
+    assert cache.get(key) is None
+
+
+def test_clear_command_removes_entries(cache, capsys):
+    list(format_many(_TEXTS, cache=cache))
+    main(["clear", "--dir", str(cache.directory)])
+    assert f"Removed {len(_TEXTS)} cached result(s)" in capsys.readouterr().out
+    assert all(
+        cache.get(ResultCache.key(text, FormatterConfig.from_args())) is None
+        for text in _TEXTS
+    )
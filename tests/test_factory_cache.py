@@ -0,0 +1,100 @@
+import mdformat
+import pytest
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts.mdit_plugins import (
+    clear_factory_cache,
+    configure_factory_cache,
+    gfm_alerts_plugin,
+)
+from mdformat_gfm_alerts.mdit_plugins._gfm_alerts import (
+    _FACTORY_CACHE,
+    _MAX_BUILT_OPENINGS,
+)
+
+_MAXSIZE = 2
+
+
+@pytest.fixture
+def fresh_cache():
+    clear_factory_cache()
+    yield
+    configure_factory_cache(None)
+    clear_factory_cache()
+
+
+pytestmark = pytest.mark.usefixtures("fresh_cache")
+
+
+def test_factory_is_shared_across_markdown_it_instances():
+    first = _FACTORY_CACHE.get(
+        None,
+        None,
+        "markdown-alert",
+        parse_nested=True,
+        match_case_sensitive=False,
+        custom_title=False,
+    )
+    MarkdownIt().use(gfm_alerts_plugin)
+    MarkdownIt().use(
+        gfm_alerts_plugin, titles=["TIP", "NOTE", "IMPORTANT", "WARNING", "CAUTION"]
+    )
+    assert len(_FACTORY_CACHE) == 1
+    assert "patterns" in vars(first)  # compiled once, up front
+    assert ("NOTE", "") in first._openings  # ruff: ignore[private-member-access]
+
+
+def test_mdformat_text_reuses_one_factory():
+    for _ in range(3):
+        mdformat.text("> [!NOTE]\n> Body.\n", extensions={"gfm_alerts"})
+    assert len(_FACTORY_CACHE) == 1
+
+
+def test_distinct_configurations_get_distinct_factories():
+    configurations: list[dict[str, object]] = [
+        {},
+        {"titles": ["FAQ"]},
+        {"icons": {"note": "<svg></svg>"}},
+        {"parse_nested": False},
+    ]
+    for kwargs in configurations:
+        MarkdownIt().use(gfm_alerts_plugin, **kwargs)
+    assert len(_FACTORY_CACHE) == len(configurations)
+
+
+def test_caller_mutating_titles_does_not_leak_into_shared_factory():
+    titles = ["FAQ"]
+    MarkdownIt().use(gfm_alerts_plugin, titles=titles)
+    titles.append("NOTE")
+    md = MarkdownIt().use(gfm_alerts_plugin, titles=["FAQ"])
+    assert "markdown-alert" not in md.render("> [!NOTE]\n> Body.\n")
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    configure_factory_cache(_MAXSIZE)
+    for title in ("A", "B", "C"):
+        MarkdownIt().use(gfm_alerts_plugin, titles=[title])
+    assert len(_FACTORY_CACHE) == _MAXSIZE
+
+    md = MarkdownIt().use(gfm_alerts_plugin, titles=["A"])
+    assert "markdown-alert-a" in md.render("> [!A]\n> Body.\n")
+
+
+def test_configure_factory_cache_rejects_negative_size():
+    with pytest.raises(ValueError, match="non-negative"):
+        configure_factory_cache(-1)
+
+
+def test_wildcard_openings_are_memoized_up_to_a_bound():
+    factory = _FACTORY_CACHE.get(
+        ["*"],
+        None,
+        "markdown-alert",
+        parse_nested=True,
+        match_case_sensitive=False,
+        custom_title=False,
+    )
+    assert factory.opening_html("FAQ", "") is factory.opening_html("FAQ", "")
+    for index in range(_MAX_BUILT_OPENINGS + 1):
+        factory.opening_html(f"T{index}", "")
+    assert len(factory._openings) == _MAX_BUILT_OPENINGS  # ruff: ignore[private-member-access]
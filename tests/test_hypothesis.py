@@ -1,17 +1,24 @@
-"""Property-based idempotency tests using Hypothesis.
+"""Property-based idempotency and performance tests using Hypothesis.
 
 Generates random markdown documents from common building blocks (lists,
-links, fenced code) and checks that formatting is idempotent: formatting
-once and formatting twice must produce the same output. Add plugin-specific
-composite strategies to `markdown_document` below to cover
-'gfm_alerts' syntax.
+links, fenced code) and 'gfm_alerts' syntax (canonical, escaped, and legacy
+markers, custom titles, nesting, and huge bodies), then checks that
+formatting is idempotent: formatting once and formatting twice must produce
+the same output. A second property bounds formatting time per input byte,
+relative to plain prose, to catch accidentally super-linear scans or
+rendering. Like the scaling harness in `tests/render/test_complexity.py`, it
+is timing-sensitive, so it only runs when
+`MDFORMAT_GFM_ALERTS_SCALING_TESTS=1` is set.
 """
 
 from __future__ import annotations
 
 import os
+import time
+from functools import cache
 
 import mdformat
+import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
 
@@ -70,6 +77,51 @@ def fenced_code_block(draw: st.DrawFn) -> str:
     return f"```{lang}\n{content}\n```"
 
 
+_ALERT_TYPES = st.sampled_from(["NOTE", "TIP", "IMPORTANT", "WARNING", "CAUTION"])
+
+_MAX_ALERT_DEPTH = 3
+
+_HUGE_BODY_LINES = 2_000
+
+
+@st.composite
+def alert_marker(draw: st.DrawFn) -> str:
+    alert_type = draw(_ALERT_TYPES)
+    casing = draw(st.sampled_from([str.upper, str.lower, str.capitalize]))
+    return draw(
+        st.sampled_from(
+            [
+                f"[!{casing(alert_type)}]",
+                f"\\[!{casing(alert_type)}\\]",
+                f"**{casing('Note')}**:",
+                f"**{casing('Warning')}**",
+            ]
+        )
+    )
+
+
+@st.composite
+def alert_body(draw: st.DrawFn) -> list[str]:
+    lines = draw(st.lists(_SAFE_TEXT, max_size=3))
+    if draw(st.integers(min_value=0, max_value=9)) == 0:
+        # A huge body repeats one line rather than drawing thousands
+        lines += [draw(_SAFE_TEXT)] * draw(
+            st.integers(min_value=100, max_value=_HUGE_BODY_LINES)
+        )
+    return lines
+
+
+@st.composite
+def alert(draw: st.DrawFn, depth: int = 1) -> str:
+    marker = draw(alert_marker())
+    if draw(st.booleans()):
+        marker += f" {draw(_SAFE_TEXT)}"
+    lines = [marker, *draw(alert_body())]
+    if depth < _MAX_ALERT_DEPTH and draw(st.booleans()):
+        lines += ["", *draw(alert(depth=depth + 1)).splitlines()]
+    return "\n".join(f"> {line}".rstrip() for line in lines)
+
+
 @st.composite
 def markdown_document(draw: st.DrawFn) -> str:
     block_strategy = st.one_of(
@@ -77,13 +129,53 @@ def markdown_document(draw: st.DrawFn) -> str:
         numbered_list(),
         bracketed_inline(),
         fenced_code_block(),
+        alert(),
     )
     blocks = draw(st.lists(block_strategy, min_size=1, max_size=5))
     return "\n\n".join(blocks)
 
 
-@given(markdown_document())
-def test_idempotency(text: str) -> None:
-    once = mdformat.text(text, extensions={"gfm_alerts"})
-    twice = mdformat.text(once, extensions={"gfm_alerts"})
+# Huge alert bodies take longer than the default deadline
+@settings(deadline=None)
+@given(markdown_document(), st.booleans())
+def test_idempotency(text: str, custom_title: bool) -> None:
+    options = {"custom_title": custom_title}
+    once = mdformat.text(text, options=options, extensions={"gfm_alerts"})
+    twice = mdformat.text(once, options=options, extensions={"gfm_alerts"})
     assert once == twice
+
+
+# Documents are repeated up to this size, so fixed per-call costs don't dominate the per-byte time
+_MIN_TIMED_BYTES = 20_000
+# Alerts cost more per byte than prose, but a super-linear scan over a huge body or deep nesting blows far past this
+_MAX_SLOWDOWN = 20
+
+
+def _seconds_per_byte(text: str) -> float:
+    repeats = -(-_MIN_TIMED_BYTES // len(text.encode()))
+    document = "\n\n".join([text] * repeats)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        mdformat.text(
+            document, options={"custom_title": True}, extensions={"gfm_alerts"}
+        )
+        best = min(best, time.perf_counter() - start)
+    return best / len(document.encode())
+
+
+@cache
+def _prose_seconds_per_byte() -> float:
+    return _seconds_per_byte(
+        "Plain prose with *emphasis* and a [link](https://example.com)."
+    )
+
+
+@pytest.mark.skipif(
+    os.environ.get("MDFORMAT_GFM_ALERTS_SCALING_TESTS") != "1",
+    reason="timing-sensitive; set MDFORMAT_GFM_ALERTS_SCALING_TESTS=1 to run",
+)
+@settings(max_examples=8, deadline=None)
+@given(markdown_document())
+def test_time_per_byte_is_bounded(text: str) -> None:
+    assert _seconds_per_byte(text) < _MAX_SLOWDOWN * _prose_seconds_per_byte()
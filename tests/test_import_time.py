@@ -0,0 +1,58 @@
+import subprocess  # ruff: ignore[suspicious-subprocess-import]
+import sys
+
+import mdformat.plugins
+
+import mdformat_gfm_alerts
+
+# Generous enough for a cold, slow CI runner: the package itself should only cost a few milliseconds
+_BUDGET_US = 50_000
+# Only imported once an interface is first used
+_DEFERRED = ("markdown_it", "mdformat", "argparse", "typing")
+
+
+def _importtime(*args):
+    """Cumulative microseconds per module imported by running `python *args`.
+
+    Modules loaded through `importlib.import_module` (as entry points are) aren't listed, but whatever they import is.
+
+    """
+    completed = subprocess.run(  # ruff: ignore[subprocess-without-shell-equals-true]
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    cumulative = {}
+    for line in completed.stderr.splitlines()[1:]:
+        # The command's own messages share stderr with the timings
+        if not line.startswith("import time:"):
+            continue
+        _self, total, name = line.removeprefix("import time:").split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def test_loading_the_entry_point_is_cheap():
+    cumulative = _importtime("-c", "import mdformat_gfm_alerts")
+    assert cumulative["mdformat_gfm_alerts"] < _BUDGET_US
+    assert not [name for name in _DEFERRED if name in cumulative]
+
+
+def test_interfaces_resolve_lazily():
+    cumulative = _importtime("-c", "from mdformat_gfm_alerts import update_mdit")
+    assert "mdformat_gfm_alerts.mdit_plugins" in cumulative
+    # Imported by `format_many` and `format_stream`, but not by the mdformat interfaces
+    assert "mdformat_gfm_alerts.batch" not in cumulative
+    assert set(mdformat_gfm_alerts.__all__) <= set(dir(mdformat_gfm_alerts))
+
+
+def test_cli_run_imports_no_parser_until_it_formats():
+    # The CLI adds every plugin's options on each run, even one with no files to format
+    assert "gfm_alerts" in mdformat.plugins.PARSER_EXTENSIONS
+    cumulative = _importtime("-m", "mdformat", "--check")
+    assert not [
+        name
+        for name in cumulative
+        if name.startswith(("markdown_it", "mdformat.renderer", "mdformat_gfm_alerts"))
+    ]
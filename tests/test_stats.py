@@ -0,0 +1,83 @@
+import io
+
+import mdformat
+from markdown_it import MarkdownIt
+
+from mdformat_gfm_alerts import format_many
+from mdformat_gfm_alerts.mdit_plugins import gfm_alerts_plugin
+from mdformat_gfm_alerts.stats import (
+    collect_stats,
+    disable_stats,
+    dump_stats,
+    enable_stats,
+    get_collector,
+)
+
+_TEXT = """\
+> [!NOTE] Heads up
+
+> **Warning**
+> Legacy body.
+
+> Plain quote.
+
+> [!TIP]
+> Outer body.
+>
+> > [!CAUTION]
+> > Inner body.
+"""
+
+
+def test_rule_counters():
+    md = MarkdownIt().use(gfm_alerts_plugin, custom_title=True)
+    with collect_stats() as stats:
+        md.render(_TEXT)
+        md.render("No markers here.\n")
+
+    assert get_collector() is None
+    # The inline-mode run that renders the custom title isn't counted as a document
+    assert (stats.documents, stats.documents_skipped) == (2, 1)
+    assert stats.blockquotes_scanned == 5  # ruff: ignore[magic-value-comparison]
+    assert stats.pattern_attempts == {"legacy": 1, "canonical": 3}
+    assert stats.matches == 4  # ruff: ignore[magic-value-comparison]
+    assert stats.empty_paragraphs_removed == 1
+    assert stats.alerts_rendered == 0
+    assert set(stats.seconds) == {"prefilter", "scan"}
+
+
+def test_render_counters_time_only_the_outermost_alert():
+    with collect_stats() as stats:
+        mdformat.text(_TEXT, extensions={"gfm_alerts"})
+
+    assert stats.alerts_rendered == 4  # ruff: ignore[magic-value-comparison]
+    assert stats.seconds["render"] > 0
+
+
+def test_batch_totals_accumulate_and_dump():
+    with collect_stats() as stats:
+        list(format_many([_TEXT] * 3))
+    output = io.StringIO()
+    dump_stats(stats, file=output)
+
+    assert stats.documents == 3  # ruff: ignore[magic-value-comparison]
+    assert "alerts rendered: 12" in output.getvalue()
+
+
+def test_nested_collection_restores_the_outer_collector():
+    with collect_stats() as outer:
+        with collect_stats() as inner:
+            mdformat.text(_TEXT, extensions={"gfm_alerts"})
+        assert get_collector() is outer
+        mdformat.text(_TEXT, extensions={"gfm_alerts"})
+
+    assert get_collector() is None
+    assert inner.documents == 1
+    assert outer.documents == 2  # ruff: ignore[magic-value-comparison]
+
+
+def test_nothing_is_collected_while_disabled():
+    stats = enable_stats()
+    disable_stats()
+    mdformat.text(_TEXT, extensions={"gfm_alerts"})
+    assert stats.documents == 0
@@ -0,0 +1,66 @@
+import mdformat
+import pytest
+
+from mdformat_gfm_alerts import format_stream
+from tests.helpers import fixture_texts
+
+_DOCUMENT = "\n\n".join(fixture_texts("format"))
+
+
+def _format_stream(tmp_path, text, options=None, **kwargs):
+    path = tmp_path / "input.md"
+    path.write_text(text, encoding="utf-8")
+    return "".join(format_stream(path, options, **kwargs))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"custom_title": True}, {"wrap": 20}, {"number": True}],
+    ids=["default", "custom_title", "wrap", "number"],
+)
+@pytest.mark.parametrize("chunk_lines", [1, 7, 1_000])
+def test_format_stream_matches_mdformat_text(tmp_path, options, chunk_lines):
+    expected = mdformat.text(_DOCUMENT, options=options, extensions={"gfm_alerts"})
+    assert _format_stream(tmp_path, _DOCUMENT, options, chunk_lines=chunk_lines) == (
+        expected
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # References apply to the whole document, whichever chunk defines them
+        "See [the docs].\n\n> [!NOTE]\n> And [more][].\n\n[more]: /more\n\n[the docs]:\n/docs\n'Title'\n",
+        # Adjacent lists alternate markers, even with a definition between them
+        "- a\n- b\n\n[x]:\n/x\n\n- c\n- d\n",
+        # Buffered lines may still join the previous block
+        "> [!TIP]\n> Body\nlazy continuation\n\nSetext\n---\n",
+    ],
+    ids=["references", "adjacent-lists", "continuations"],
+)
+@pytest.mark.parametrize("options", [{}, {"wrap": "no"}], ids=["keep", "no-wrap"])
+def test_format_stream_across_chunk_boundaries(tmp_path, text, options):
+    expected = mdformat.text(text, options=options, extensions={"gfm_alerts"})
+    assert _format_stream(tmp_path, text, options, chunk_lines=1) == expected
+
+
+def test_format_stream_yields_before_reading_everything(tmp_path):
+    path = tmp_path / "input.md"
+    path.write_text("> [!NOTE]\n> Body.\n\n" * 100, encoding="utf-8")
+    chunks = format_stream(path, chunk_lines=10)
+    assert next(chunks).startswith("> [!NOTE]")
+    assert len(list(chunks)) > 1
+
+
+def test_format_stream_buffers_a_long_list_whole(tmp_path):
+    items = 100
+    text = "".join(f"- Item {index}\n" for index in range(items)) + "\nAfter.\n"
+    path = tmp_path / "input.md"
+    path.write_text(text, encoding="utf-8")
+    chunks = list(format_stream(path, chunk_lines=10))
+    assert chunks[0].count("- Item") == items
+    assert "".join(chunks) == mdformat.text(text, extensions={"gfm_alerts"})
+
+
+def test_format_stream_empty_file(tmp_path):
+    assert not _format_stream(tmp_path, "")